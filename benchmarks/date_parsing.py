@@ -0,0 +1,60 @@
+"""
+Compare parse_date with the strptime-based parsing it replaced.
+
+Both parsers convert the same list of Canvas timestamps, in the
+`2012-05-05T00:00:00Z` form that both accept. Run from the repository
+root::
+
+    python benchmarks/date_parsing.py [--count N]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse
+from datetime import datetime, timedelta
+import os
+import re
+import sys
+import time
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from canvasapi.canvas_object import parse_date  # noqa: E402
+
+STRPTIME_PATTERN = re.compile('[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}Z')
+
+
+def parse_date_strptime(value):
+    if STRPTIME_PATTERN.match(value):
+        naive = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+        return naive.replace(tzinfo=pytz.utc)
+
+
+def make_timestamps(count):
+    start = datetime(2012, 1, 1)
+    return [
+        (start + timedelta(seconds=index * 7919)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--count', type=int, default=1000000)
+    args = parser.parse_args()
+
+    timestamps = make_timestamps(args.count)
+    print('%d timestamps\n' % (args.count))
+
+    results = {}
+    for name, parse in (('strptime', parse_date_strptime), ('parse_date', parse_date)):
+        started = time.time()
+        results[name] = [parse(value) for value in timestamps]
+        elapsed = time.time() - started
+        print('%-10s %8.3f s %10.0f /s' % (name, elapsed, args.count / elapsed))
+
+    assert results['strptime'] == results['parse_date']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the JSON codecs available to canvasapi on the test fixtures.
+
+Every fixture body in ``tests/fixtures`` is encoded once, then each
+installed codec decodes and encodes the whole set repeatedly. Run from the
+repository root::
+
+    python benchmarks/json_codecs.py [--repeat N]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse
+import glob
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from canvasapi.json_codec import PREFERRED_CODECS, get_codec  # noqa: E402
+
+
+def load_fixtures():
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'fixtures')
+    bodies = []
+    for path in sorted(glob.glob(os.path.join(root, '*.json'))):
+        with open(path) as fixture:
+            for entry in json.load(fixture).values():
+                if entry.get('data') is not None:
+                    bodies.append(entry['data'])
+    return bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = load_fixtures()
+    payloads = [json.dumps(body).encode('utf-8') for body in bodies]
+    size = sum(len(payload) for payload in payloads)
+    print('%d fixture bodies, %d bytes, %d repetitions\n' % (len(payloads), size, args.repeat))
+    print('%-8s %12s %12s %12s' % ('codec', 'loads (ms)', 'dumps (ms)', 'MB/s loads'))
+
+    for name in PREFERRED_CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print('%-8s %12s' % (name, 'not installed'))
+            continue
+
+        loads = min(timeit.repeat(
+            lambda: [codec.loads(payload) for payload in payloads],
+            number=args.repeat,
+            repeat=3
+        ))
+        dumps = min(timeit.repeat(
+            lambda: [codec.dumps(body) for body in bodies],
+            number=args.repeat,
+            repeat=3
+        ))
+        print('%-8s %12.2f %12.2f %12.1f' % (
+            name,
+            loads * 1000,
+            dumps * 1000,
+            size * args.repeat / loads / 1e6
+        ))
+
+
+if __name__ == '__main__':
+    main()
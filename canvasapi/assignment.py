@@ -9,6 +9,17 @@ from canvasapi.util import combine_kwargs
 @python_2_unicode_compatible
 class Assignment(CanvasObject):
 
+    _schema = {
+        'submission': 'canvasapi.submission.Submission',
+        'created_at': 'date',
+        'updated_at': 'date',
+        'due_at': 'date',
+        'lock_at': 'date',
+        'unlock_at': 'date',
+        'peer_reviews_assign_at': 'date'
+    }
+    _schema_complete = True
+
     def __str__(self):
         return "{} ({})".format(self.name, self.id)
 
@@ -51,6 +62,8 @@ class Assignment(CanvasObject):
 @python_2_unicode_compatible
 class AssignmentGroup(CanvasObject):
 
+    _schema = {'assignments': Assignment}
+
     def __str__(self):
         return "{} ({})".format(self.name, self.id)
 
@@ -0,0 +1,174 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
+from canvasapi.canvas import Canvas
+from canvasapi.canvas_object import CanvasObject
+from canvasapi.paginated_list import PaginatedList
+
+
+class AsyncCanvas(object):
+    """
+    An asyncio front end to :class:`canvasapi.Canvas`.
+
+    Every method available on :class:`canvasapi.Canvas` and on the objects it
+    returns is exposed as an awaitable. Calls are dispatched to a pool of
+    worker threads which all share a single requester, so one event loop can
+    keep many requests in flight at once.
+
+    Requires Python 3.5.2 or newer.
+    """
+
+    def __init__(self, base_url, access_token, max_workers=32, executor=None, **kwargs):
+        """
+        :param base_url: The base URL of the Canvas instance's API.
+        :type base_url: str
+        :param access_token: The API key to authenticate requests with.
+        :type access_token: str
+        :param max_workers: The number of worker threads used to issue
+            requests, which is also the default `pool_maxsize`, so that
+            each thread can keep a connection open. Ignored if `executor`
+            is provided.
+        :type max_workers: int
+        :param executor: An optional executor to run requests on. If
+            provided, the caller is responsible for shutting it down.
+        :type executor: :class:`concurrent.futures.Executor`
+        :param kwargs: Additional options passed through to
+            :class:`canvasapi.Canvas`.
+        """
+        if executor is None:
+            kwargs.setdefault('pool_maxsize', max_workers)
+        self._canvas = Canvas(base_url, access_token, **kwargs)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+
+    def __getattr__(self, name):
+        return _wrap(getattr(self._canvas, name), self._executor)
+
+    def __repr__(self):
+        return '<AsyncCanvas>'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the worker threads, if they were created by this object.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+
+class AsyncProxy(object):
+    """
+    Wraps a :class:`canvasapi.canvas_object.CanvasObject` so that its methods
+    return awaitables. Plain attributes are returned unchanged.
+    """
+
+    def __init__(self, obj, executor):
+        self._obj = obj
+        self._executor = executor
+
+    def __getattr__(self, name):
+        return _wrap(getattr(self._obj, name), self._executor)
+
+    def __repr__(self):
+        return '<AsyncProxy of %r>' % (self._obj,)
+
+    def __str__(self):
+        return str(self._obj)
+
+    def unwrap(self):
+        """
+        Return the underlying synchronous object.
+
+        :rtype: :class:`canvasapi.canvas_object.CanvasObject`
+        """
+        return self._obj
+
+
+class AsyncPaginatedList(object):
+    """
+    An asynchronous iterator over a :class:`canvasapi.paginated_list.PaginatedList`.
+
+    Elements are pulled from the wrapped list in chunks on a worker thread,
+    so buffered elements are yielded without returning to the executor.
+    """
+
+    def __init__(self, paginated_list, executor, chunk_size=100):
+        self._list = paginated_list
+        self._executor = executor
+        self._chunk_size = chunk_size
+        self._iterator = None
+        self._buffer = []
+
+    def __repr__(self):
+        return '<Async%s' % (repr(self._list)[1:],)
+
+    def __aiter__(self):
+        self._iterator = iter(self._list)
+        self._buffer = []
+        return self
+
+    async def __anext__(self):
+        if not self._buffer:
+            loop = asyncio.get_event_loop()
+            self._buffer = await loop.run_in_executor(self._executor, self._next_chunk)
+            if not self._buffer:
+                raise StopAsyncIteration
+        return _wrap(self._buffer.pop(0), self._executor)
+
+    def _next_chunk(self):
+        chunk = []
+        for element in self._iterator:
+            chunk.append(element)
+            if len(chunk) >= self._chunk_size:
+                break
+        return chunk
+
+    async def to_list(self):
+        """
+        Collect every element of the list.
+
+        :rtype: list
+        """
+        elements = []
+        async for element in self:
+            elements.append(element)
+        return elements
+
+    def unwrap(self):
+        """
+        Return the underlying synchronous list.
+
+        :rtype: :class:`canvasapi.paginated_list.PaginatedList`
+        """
+        return self._list
+
+
+def _wrap(value, executor):
+    """
+    Wrap a value returned from a synchronous object for asynchronous use.
+
+    Bound methods become coroutine functions which run on `executor`, and
+    their results are wrapped in turn.
+    """
+    if isinstance(value, CanvasObject):
+        return AsyncProxy(value, executor)
+    if isinstance(value, PaginatedList):
+        return AsyncPaginatedList(value, executor)
+    if callable(value) and not isinstance(value, type):
+        @functools.wraps(value)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                executor,
+                functools.partial(value, *args, **kwargs)
+            )
+            return _wrap(result, executor)
+        return call
+    return value
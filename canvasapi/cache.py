@@ -0,0 +1,501 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from six import text_type
+
+
+class ResponseCache(object):
+    """
+    Base class for caches of successful `GET` responses.
+
+    Entries are keyed on the request URL, its normalized parameters and the
+    access token used. Each entry expires after a time to live, which can
+    be set per endpoint with `ttls`, a dictionary mapping regular
+    expressions matched against the endpoint (for example
+    `r'^courses/\\d+$'`) to a number of seconds. The first matching
+    pattern wins; a time to live of `0` disables caching for an endpoint.
+
+    Expired entries are kept until they are evicted. If Canvas sent an
+    `ETag` or `Last-Modified` header with a response, :func:`conditional_headers`
+    returns the validators to send with the next request, and a `304 Not
+    Modified` reply renews the entry with :func:`revalidate` instead of
+    downloading the body again.
+
+    Subclasses store entries by implementing :func:`_load` and :func:`_store`,
+    and either :func:`_delete` and :func:`_paths` or their own
+    :func:`invalidate` and :func:`clear`.
+    """
+
+    def __init__(self, ttl=300, ttls=None, clock=time.time):
+        """
+        :param ttl: The default time to live of an entry, in seconds.
+        :type ttl: float
+        :param ttls: Times to live for specific endpoints.
+        :type ttls: dict
+        :param clock: A function returning the current time in seconds.
+        :type clock: callable
+        """
+        self.ttl = ttl
+        self.ttls = [(re.compile(pattern), value) for pattern, value in (ttls or {}).items()]
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._clock = clock
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Locks cannot be copied or pickled; __setstate__ creates a new one.
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def ttl_for(self, path):
+        """
+        Return the time to live for an endpoint.
+
+        :param path: The endpoint, relative to the API's base URL.
+        :type path: str
+        :rtype: float
+        """
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.ttl
+
+    @staticmethod
+    def make_key(url, params, access_token=None):
+        """
+        Build the cache key for a request.
+
+        :param url: The full URL of the request.
+        :type url: str
+        :param params: The request parameters as a list of 2-tuples.
+        :type params: list
+        :param access_token: The access token used for the request.
+        :type access_token: str
+        :rtype: str
+        """
+        normalized = sorted((text_type(key), text_type(value)) for key, value in params)
+        token = hashlib.sha1((access_token or '').encode('utf-8')).hexdigest()
+        return '%s %s %s' % (token, url, json.dumps(normalized))
+
+    def get(self, key):
+        """
+        Return a cached response, or `None` if there is no fresh entry.
+
+        :param key: str
+        :rtype: :class:`requests.Response`
+        """
+        with self._lock:
+            entry = self._load(key)
+            if entry is None or entry['expires_at'] <= self._clock():
+                self.misses += 1
+                return None
+            self.hits += 1
+        return build_response(entry)
+
+    def conditional_headers(self, key):
+        """
+        Return the headers for a conditional request revalidating an entry.
+
+        :param key: str
+        :returns: `If-None-Match` and/or `If-Modified-Since` headers, or an
+            empty dictionary if the entry is missing or has no validators.
+        :rtype: dict
+        """
+        with self._lock:
+            entry = self._load(key)
+        if entry is None:
+            return {}
+
+        headers = CaseInsensitiveDict(entry['headers'])
+        conditional = {}
+        if 'ETag' in headers:
+            conditional['If-None-Match'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            conditional['If-Modified-Since'] = headers['Last-Modified']
+        return conditional
+
+    def revalidate(self, key, response):
+        """
+        Renew an entry after Canvas replied `304 Not Modified` to a
+        conditional request, and return the cached response.
+
+        :param key: str
+        :param response: The `304` response.
+        :type response: :class:`requests.Response`
+        :returns: The cached response, or `None` if the entry has been
+            evicted in the meantime.
+        :rtype: :class:`requests.Response`
+        """
+        with self._lock:
+            entry = self._load(key)
+            if entry is None:
+                return None
+
+            entry = dict(entry)
+            entry['headers'] = CaseInsensitiveDict(entry['headers'])
+            for name in ('Date', 'ETag', 'Last-Modified'):
+                if name in response.headers:
+                    entry['headers'][name] = response.headers[name]
+            entry['headers'] = dict(entry['headers'])
+            entry['expires_at'] = self._clock() + self.ttl_for(entry['path'])
+            self._store(key, entry)
+            self.revalidations += 1
+        return build_response(entry)
+
+    def set(self, key, path, response):
+        """
+        Store a response.
+
+        :param key: str
+        :param path: The endpoint the response was fetched from.
+        :type path: str
+        :param response: :class:`requests.Response`
+        """
+        ttl = self.ttl_for(path)
+        if not ttl:
+            return
+
+        entry = {
+            'path': path,
+            'url': response.url,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'content': response.content,
+            'expires_at': self._clock() + ttl,
+        }
+        with self._lock:
+            self._store(key, entry)
+
+    def invalidate(self, path):
+        """
+        Remove the entries affected by a change to an endpoint: the
+        endpoint itself, everything below it, and the collections
+        containing it.
+
+        :param path: The endpoint that was changed.
+        :type path: str
+        """
+        changed = _segments(path)
+        with self._lock:
+            for key, cached_path in list(self._paths()):
+                cached = _segments(cached_path)
+                shortest = min(len(cached), len(changed))
+                if cached[:shortest] == changed[:shortest]:
+                    self._delete(key)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            for key, _ in list(self._paths()):
+                self._delete(key)
+
+    def _load(self, key):  # pragma: no cover
+        raise NotImplementedError
+
+    def _store(self, key, entry):  # pragma: no cover
+        raise NotImplementedError
+
+    def _delete(self, key):  # pragma: no cover
+        raise NotImplementedError
+
+    def _paths(self):  # pragma: no cover
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """
+    An in-memory response cache holding at most `maxsize` entries, evicting
+    the least recently used entry first.
+    """
+
+    def __init__(self, maxsize=1024, **kwargs):
+        """
+        :param maxsize: The maximum number of entries to keep.
+        :type maxsize: int
+        :param kwargs: Options passed to :class:`ResponseCache`.
+        """
+        super(MemoryCache, self).__init__(**kwargs)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._entries[key] = entry
+        return entry
+
+    def _store(self, key, entry):
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _delete(self, key):
+        self._entries.pop(key, None)
+
+    def _paths(self):
+        return [(key, entry['path']) for key, entry in self._entries.items()]
+
+
+#: The columns of the table used by :class:`SqliteCache`, in order.
+_SQLITE_COLUMNS = (
+    'key', 'path', 'segments', 'url', 'status_code', 'headers', 'content', 'expires_at',
+    'used_at'
+)
+
+
+class SqliteCache(ResponseCache):
+    """
+    A response cache stored in an SQLite database, so that it persists
+    between runs. It holds at most `maxsize` entries, evicting the least
+    recently used entry first.
+
+    A copied or unpickled cache opens a new connection to the same
+    database file.
+
+    Reading an entry does not write to the database: the time it was
+    used is recorded in memory and saved with the next change, or when
+    the cache is closed.
+    """
+
+    #: The number of reads recorded in memory before they are saved.
+    MAX_PENDING_READS = 1000
+
+    def __init__(self, path, maxsize=100000, **kwargs):
+        """
+        :param path: The path of the database file.
+        :type path: str
+        :param maxsize: The maximum number of entries to keep.
+        :type maxsize: int
+        :param kwargs: Options passed to :class:`ResponseCache`.
+        """
+        super(SqliteCache, self).__init__(**kwargs)
+        self.path = path
+        self.maxsize = maxsize
+        self._used = {}
+        self._open()
+
+    def __getstate__(self):
+        # A copy opens its own connection to the same database, so save
+        # the pending reads first.
+        with self._lock:
+            self._save_reads()
+            self._connection.commit()
+            state = super(SqliteCache, self).__getstate__()
+        del state['_connection']
+        del state['_count']
+        return state
+
+    def __setstate__(self, state):
+        super(SqliteCache, self).__setstate__(state)
+        self._open()
+
+    def _open(self):
+        """
+        Connect to the database, creating the table if needed, and count
+        its entries.
+        """
+        path = self.path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        # The database may be shared with other tables; never drop or
+        # write to a table this class did not create.
+        columns = [
+            row[1] for row in self._connection.execute('PRAGMA table_info(canvasapi_responses)')
+        ]
+        if columns and columns != list(_SQLITE_COLUMNS):
+            self._connection.close()
+            raise ValueError(
+                'The table canvasapi_responses in %s has unexpected columns: %s.' % (
+                    path,
+                    ', '.join(columns)
+                )
+            )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS canvasapi_responses ('
+            'key TEXT PRIMARY KEY, path TEXT, segments TEXT, url TEXT, '
+            'status_code INTEGER, headers TEXT, content BLOB, expires_at REAL, '
+            'used_at REAL)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS canvasapi_responses_segments '
+            'ON canvasapi_responses (segments)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS canvasapi_responses_used_at '
+            'ON canvasapi_responses (used_at)'
+        )
+        self._connection.commit()
+
+        # Counting the rows takes a full scan, so it is only done once.
+        self._count = self._connection.execute(
+            'SELECT COUNT(*) FROM canvasapi_responses'
+        ).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._count
+
+    def close(self):
+        """
+        Save the pending reads and close the database connection.
+        """
+        with self._lock:
+            self._save_reads()
+            self._connection.commit()
+            self._connection.close()
+
+    def invalidate(self, path):
+        """
+        Remove the entries affected by a change to an endpoint: the
+        endpoint itself, everything below it, and the collections
+        containing it.
+
+        :param path: The endpoint that was changed.
+        :type path: str
+        """
+        changed = _segments(path)
+        if not changed:
+            self.clear()
+            return
+
+        # The endpoint and everything below it share its segments as a
+        # prefix, and sort before the same prefix with '/' replaced by the
+        # next character, '0'.
+        prefix = _joined(changed)
+        ancestors = [_joined(changed[:length]) for length in range(len(changed))]
+        with self._lock:
+            deleted = self._connection.execute(
+                'DELETE FROM canvasapi_responses WHERE (segments >= ? AND segments < ?) '
+                'OR segments IN (%s)' % (', '.join('?' * len(ancestors))),
+                [prefix, prefix[:-1] + '0'] + ancestors
+            ).rowcount
+            self._count -= deleted
+            self._connection.commit()
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._used.clear()
+            self._connection.execute('DELETE FROM canvasapi_responses')
+            self._count = 0
+            self._connection.commit()
+
+    def _load(self, key):
+        row = self._connection.execute(
+            'SELECT path, url, status_code, headers, content, expires_at '
+            'FROM canvasapi_responses WHERE key = ?',
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._used[key] = self._clock()
+        if len(self._used) >= self.MAX_PENDING_READS:
+            self._save_reads()
+            self._connection.commit()
+        return {
+            'path': row[0],
+            'url': row[1],
+            'status_code': row[2],
+            'headers': json.loads(row[3]),
+            'content': bytes(row[4]),
+            'expires_at': row[5],
+        }
+
+    def _store(self, key, entry):
+        exists = self._connection.execute(
+            'SELECT 1 FROM canvasapi_responses WHERE key = ?',
+            (key,)
+        ).fetchone()
+        self._connection.execute(
+            'INSERT OR REPLACE INTO canvasapi_responses '
+            '(key, path, segments, url, status_code, headers, content, expires_at, used_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                key,
+                entry['path'],
+                _joined(_segments(entry['path'])),
+                entry['url'],
+                entry['status_code'],
+                json.dumps(entry['headers']),
+                sqlite3.Binary(entry['content']),
+                entry['expires_at'],
+                self._clock(),
+            )
+        )
+        if exists is None:
+            self._count += 1
+        self._used.pop(key, None)
+        self._save_reads()
+
+        # Evict the least recently used entries through the used_at index,
+        # without stepping over the entries that are kept.
+        if self._count > self.maxsize:
+            self._count -= self._connection.execute(
+                'DELETE FROM canvasapi_responses WHERE key IN ('
+                'SELECT key FROM canvasapi_responses ORDER BY used_at ASC, rowid ASC LIMIT ?)',
+                (self._count - self.maxsize,)
+            ).rowcount
+        self._connection.commit()
+
+    def _save_reads(self):
+        """
+        Write the times at which entries were read, without committing.
+        """
+        if self._used:
+            self._connection.executemany(
+                'UPDATE canvasapi_responses SET used_at = ? WHERE key = ?',
+                [(used_at, key) for key, used_at in self._used.items()]
+            )
+            self._used.clear()
+
+
+def build_response(entry):
+    """
+    Rebuild a :class:`requests.Response` from a cache entry.
+
+    :param entry: dict
+    :rtype: :class:`requests.Response`
+    """
+    response = requests.Response()
+    response.status_code = entry['status_code']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response.url = entry['url']
+    response._content = entry['content']
+    response.from_cache = True
+    return response
+
+
+def _segments(path):
+    return [segment for segment in path.split('?', 1)[0].split('/') if segment]
+
+
+def _joined(segments):
+    """
+    Join the segments of an endpoint into the form stored by
+    :class:`SqliteCache`, with a trailing '/' after each segment.
+    """
+    return ''.join(segment + '/' for segment in segments)
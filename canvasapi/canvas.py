@@ -1,4 +1,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+import functools
 
 from canvasapi.account import Account
 from canvasapi.course import Course
@@ -18,14 +20,16 @@ class Canvas(object):
     The main class to be instantiated to provide access to Canvas's API.
     """
 
-    def __init__(self, base_url, access_token):
+    def __init__(self, base_url, access_token, **kwargs):
         """
         :param base_url: The base URL of the Canvas instance's API.
         :type base_url: str
         :param access_token: The API key to authenticate requests with.
         :type access_token: str
+        :param kwargs: Additional options to configure the requester with.
+            See :class:`canvasapi.requester.Requester` for the full list.
         """
-        self.__requester = Requester(base_url, access_token)
+        self.__requester = Requester(base_url, access_token, **kwargs)
 
     def create_account(self, **kwargs):
         """
@@ -873,3 +877,80 @@ class Canvas(object):
             _kwargs=combine_kwargs(**kwargs)
         )
         return response.json()
+
+    def gather(self, calls, concurrency=8, return_exceptions=True):
+        """
+        Run several calls concurrently and collect their results.
+
+        Each call runs on a pool of worker threads sharing this object's
+        requester, so the rate limiter and connection pool apply across
+        the whole batch. A failing call does not cancel the others.
+
+        .. code:: python
+
+            courses = canvas.gather(
+                [functools.partial(canvas.get_course, course_id) for course_id in ids],
+                concurrency=16
+            )
+
+        :param calls: Callables taking no arguments, such as bound methods
+            wrapped in :func:`functools.partial`.
+        :type calls: iterable
+        :param concurrency: The number of calls to run at once.
+        :type concurrency: int
+        :param return_exceptions: If `True`, the exception raised by a
+            failing call is returned in its place. If `False`, the first
+            exception, in input order, is raised once every call has
+            finished.
+        :type return_exceptions: bool
+        :returns: The result of each call, in the same order as `calls`.
+        :rtype: list
+        """
+        def run(call):
+            try:
+                return call(), None
+            except Exception as e:
+                return None, e
+
+        calls = list(calls)
+        if not calls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(calls))) as executor:
+            outcomes = list(executor.map(run, calls))
+
+        results = []
+        for result, error in outcomes:
+            if error is not None and not return_exceptions:
+                raise error
+            results.append(error if error is not None else result)
+        return results
+
+    def map(self, func, iterable, concurrency=8, return_exceptions=True):
+        """
+        Call `func` once for each item of `iterable`, concurrently.
+
+        .. code:: python
+
+            courses = canvas.map(canvas.get_course, course_ids, concurrency=16)
+
+        See :func:`gather` for how calls are run and failures reported.
+
+        :param func: A callable taking a single argument, typically a bound
+            method such as `canvas.get_course` or `course.get_assignment`.
+        :type func: callable
+        :param iterable: The arguments to call `func` with.
+        :type iterable: iterable
+        :param concurrency: The number of calls to run at once.
+        :type concurrency: int
+        :param return_exceptions: Whether failures are returned in place
+            of results rather than raised.
+        :type return_exceptions: bool
+        :returns: The result for each item, in the same order as `iterable`.
+        :rtype: list
+        """
+        return self.gather(
+            [functools.partial(func, item) for item in iterable],
+            concurrency=concurrency,
+            return_exceptions=return_exceptions
+        )
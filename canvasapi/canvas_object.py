@@ -1,12 +1,18 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
+from importlib import import_module
 import pytz
 import re
 
-from six import text_type
+from six import string_types
 
-DATE_PATTERN = re.compile('[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}Z')
+from canvasapi.json_codec import get_codec
+
+DEFAULT_CODEC = get_codec()
+DATE_PATTERN = re.compile(
+    r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})'
+    r'(?:[.]([0-9]+))?(Z|[+-][0-9]{2}:?[0-9]{2})\Z'
+)
 
 
 class CanvasObject(object):
@@ -15,8 +21,20 @@ class CanvasObject(object):
 
     This makes a call to :func:`canvasapi.canvas_object.CanvasObject.set_attributes`
     to dynamically construct this object's attributes with a JSON object.
+
+    Subclasses may declare the types of their fields in `_schema`, a
+    dictionary mapping field names to either a :class:`CanvasObject`
+    subclass, or its dotted path, with which nested objects and lists of
+    objects are built, `'date'` for a date, which is kept as is and also
+    parsed into a `*_date` attribute, or a function converting the value.
+    The schema is applied when the requester was created with
+    `typed_attributes`. If `_schema_complete` is also set, the fields
+    missing from the schema are not checked for dates.
     """
 
+    _schema = {}
+    _schema_complete = False
+
     def __init__(self, requester, attributes):
         """
         :param requester: The requester to pass HTTP requests through.
@@ -27,6 +45,29 @@ class CanvasObject(object):
         self._requester = requester
         self.set_attributes(attributes)
 
+    def __getattr__(self, name):
+        """
+        Build an attribute of a lazily loaded object from its JSON on first
+        access, and store it so later reads are plain attribute lookups.
+        """
+        raw = self.__dict__.get('_lazy_attributes')
+        if raw is not None and name in raw:
+            value = raw[name]
+            schema = _typed_schema(self)
+            if schema is not None and name in schema:
+                value = schema[name](self._requester, value)
+        else:
+            value = None
+            if raw is not None and name.endswith('_date') and _has_date(self, name[:-5]):
+                value = _date_or_none(raw.get(name[:-5]))
+            if value is None:
+                raise AttributeError(
+                    "'%s' object has no attribute '%s'" % (self.__class__.__name__, name)
+                )
+
+        self.__dict__[name] = value
+        return value
+
     def __repr__(self):  # pragma: no cover
         classname = self.__class__.__name__
         attrs = ', '.join(['%s=%s' % (attr, val) for attr, val in self.__dict__.items() if attr != 'attributes'])  # noqa
@@ -36,8 +77,12 @@ class CanvasObject(object):
         """
         Return the original JSON response from the API that was used to
         construct the object.
+
+        The JSON is encoded with the requester's JSON codec, or with the
+        fastest one installed if the object has no requester.
         """
-        return json.dumps(self.attributes)
+        codec = getattr(self._requester, 'json_codec', None) or DEFAULT_CODEC
+        return codec.dumps(self.attributes)
 
     def set_attributes(self, attributes):
         """
@@ -60,16 +105,306 @@ class CanvasObject(object):
         so two additional datetime attributes are created, `start_at_date`
         and `end_at_date`.
 
+        If the requester was created with `typed_attributes`, the fields
+        declared in the class's `_schema` are converted instead, so nested
+        JSON objects become :class:`CanvasObject` instances.
+
+        If the requester was created with `lazy_attributes`, the fields are
+        only kept as JSON, and each attribute is built the first time it is
+        read.
+
         :param attributes: The JSON object to build this object with.
         :type attributes: dict
         """
+        if isinstance(self, CompactRecord):
+            # Subclasses call super(Class, self).set_attributes(), which
+            # skips the mixin that compact_class() puts before them.
+            return CompactRecord.set_attributes(self, attributes)
+
         self.attributes = attributes
 
+        if getattr(self._requester, 'lazy_attributes', False):
+            raw = self.__dict__.setdefault('_lazy_attributes', {})
+            for attribute in attributes:
+                self.__dict__.pop(attribute, None)
+                self.__dict__.pop(attribute + '_date', None)
+            raw.update(attributes)
+            return
+
+        schema = _typed_schema(self)
+        scan_dates = schema is None or not self._schema_complete
         for attribute, value in attributes.items():
+            converter = schema.get(attribute) if schema is not None else None
+            if converter is not None and converter is not _keep_date:
+                self.__setattr__(attribute, converter(self._requester, value))
+                continue
+
             self.__setattr__(attribute, value)
 
             # datetime field
-            if DATE_PATTERN.match(text_type(value)):
-                naive = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
-                aware = naive.replace(tzinfo=pytz.utc)
-                self.__setattr__(attribute + '_date', aware)
+            if scan_dates or converter is _keep_date:
+                date = _date_or_none(value)
+                if date is not None:
+                    self.__setattr__(attribute + '_date', date)
+
+
+def parse_date(value):
+    """
+    Convert a date in the ISO8601 format used by Canvas to an aware
+    datetime in UTC.
+
+    Fractional seconds and UTC offsets are supported, so
+    `2012-05-05T00:00:00Z`, `2012-05-05T00:00:00.123Z` and
+    `2012-05-04T18:00:00-06:00` are all accepted.
+
+    :param value: str
+    :raises ValueError: If the value is not a date in this format.
+    :rtype: :class:`datetime.datetime`
+    """
+    match = DATE_PATTERN.match(value)
+    if match is None:
+        raise ValueError('%r is not an ISO8601 date.' % (value))
+    return _build_date(match)
+
+
+def _date_or_none(value):
+    if not isinstance(value, string_types):
+        return None
+    match = DATE_PATTERN.match(value)
+    if match is None:
+        return None
+    try:
+        return _build_date(match)
+    except ValueError:
+        return None
+
+
+def _build_date(match):
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    date = datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second),
+        int(fraction[:6].ljust(6, '0')) if fraction else 0,
+        pytz.utc
+    )
+
+    if offset != 'Z':
+        minutes = int(offset[1:3]) * 60 + int(offset[-2:])
+        if minutes:
+            date -= timedelta(minutes=-minutes if offset[0] == '-' else minutes)
+    return date
+
+
+def _has_date(obj, name):
+    """
+    Return whether a `*_date` attribute is built for a field of an object.
+    """
+    schema = _typed_schema(obj)
+    if schema is None:
+        return True
+    converter = schema.get(name)
+    if converter is None:
+        return not obj._schema_complete
+    return converter is _keep_date
+
+
+def _typed_schema(obj):
+    """
+    Return the compiled schema of an object's class if its requester
+    converts typed attributes, or `None`.
+    """
+    if not getattr(obj._requester, 'typed_attributes', False):
+        return None
+    return _compile_schema(obj.__class__)
+
+
+_compiled_schemas = {}
+
+
+def _compile_schema(cls):
+    """
+    Resolve the `_schema` of a class into a dictionary mapping field
+    names to functions of the requester and the value, once per class.
+
+    :param cls: type
+    :rtype: dict
+    """
+    compiled = _compiled_schemas.get(cls)
+    if compiled is None:
+        compiled = {}
+        for name, converter in cls._schema.items():
+            if converter == 'date':
+                compiled[name] = _keep_date
+                continue
+            if isinstance(converter, string_types):
+                module, _, class_name = converter.rpartition('.')
+                converter = getattr(import_module(module), class_name)
+
+            if isinstance(converter, type) and issubclass(converter, CanvasObject):
+                compiled[name] = _nested_converter(converter)
+            else:
+                compiled[name] = _value_converter(converter)
+        _compiled_schemas[cls] = compiled
+    return compiled
+
+
+def _keep_date(requester, value):
+    return value
+
+
+def _nested_converter(content_class):
+    def convert(requester, value):
+        if isinstance(value, dict):
+            return content_class(requester, value)
+        if isinstance(value, list):
+            return [convert(requester, item) for item in value]
+        return value
+    return convert
+
+
+def _value_converter(converter):
+    def convert(requester, value):
+        return converter(value)
+    return convert
+
+
+class CompactRecord(object):
+    """
+    Mixin storing the fields of an object in a tuple instead of an instance
+    dictionary. The position of each field is looked up in a key table
+    shared by every record with the same fields, and `*_date` attributes
+    are computed when they are read.
+
+    Use :func:`compact_class` to combine it with a subclass of
+    :class:`CanvasObject`.
+    """
+
+    __slots__ = ('_requester', '_keys', '_values', '_converted')
+
+    def __init__(self, requester, attributes, key_tables=None):
+        """
+        :param requester: The requester to pass HTTP requests through.
+        :type requester: :class:`canvasapi.requester.Requester`
+        :param attributes: The JSON object to build this object with.
+        :type attributes: dict
+        :param key_tables: A cache of key tables, keyed by the tuple of
+            field names, shared between the records of one listing.
+        :type key_tables: dict
+        """
+        self._requester = requester
+
+        names = tuple(attributes)
+        keys = None if key_tables is None else key_tables.get(names)
+        if keys is None:
+            keys = _key_table(names)
+            if key_tables is not None:
+                key_tables[names] = keys
+
+        self._keys = keys
+        self._values = tuple(attributes[name] for name in names)
+        self._converted = None
+
+    def __getattr__(self, name):
+        if name in CompactRecord.__slots__:
+            raise AttributeError(name)
+
+        keys = self._keys
+        if name in keys:
+            value = self._values[keys[name]]
+            schema = _typed_schema(self)
+            if schema is not None and name in schema:
+                # Build nested objects once, as the other modes do.
+                converted = self._converted
+                if converted is None:
+                    converted = self._converted = {}
+                if name not in converted:
+                    converted[name] = schema[name](self._requester, value)
+                value = converted[name]
+            return value
+
+        if name.endswith('_date') and name[:-5] in keys and _has_date(self, name[:-5]):
+            date = _date_or_none(self._values[keys[name[:-5]]])
+            if date is not None:
+                return date
+
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (self.__class__.__name__, name)
+        )
+
+    def __repr__(self):
+        attrs = ', '.join(['%s=%s' % (attr, val) for attr, val in self.attributes.items()])
+        return '%s(%s)' % (self.__class__.__name__, attrs)
+
+    def __reduce__(self):
+        # The compact class shares its name with the class it wraps, so
+        # pickle can't find it by name; rebuild it from that class instead.
+        return (_rebuild_compact, (self._content_class, self._requester, self.attributes))
+
+    @property
+    def attributes(self):
+        """
+        The JSON object this record was built with.
+
+        :rtype: dict
+        """
+        values = self._values
+        return dict((name, values[index]) for name, index in self._keys.items())
+
+    def set_attributes(self, attributes):
+        """
+        Update this record's fields.
+
+        :param attributes: The fields to add or replace.
+        :type attributes: dict
+        """
+        merged = self.attributes
+        merged.update(attributes)
+
+        names = tuple(merged)
+        self._keys = _key_table(names)
+        self._values = tuple(merged[name] for name in names)
+        self._converted = None
+
+
+_compact_classes = {}
+
+
+def compact_class(content_class):
+    """
+    Return a subclass of a :class:`CanvasObject` subclass whose instances
+    are stored as :class:`CompactRecord` instances. It has the same name,
+    methods and attributes as `content_class`.
+
+    :param content_class: The class to make compact.
+    :type content_class: type
+    :rtype: type
+    """
+    compact = _compact_classes.get(content_class)
+    if compact is None:
+        compact = type(
+            str(content_class.__name__),
+            (CompactRecord, content_class),
+            {
+                '__slots__': (),
+                '__module__': content_class.__module__,
+                '_content_class': content_class
+            }
+        )
+        _compact_classes[content_class] = compact
+    return compact
+
+
+def _rebuild_compact(content_class, requester, attributes):
+    """
+    Rebuild a compact record when it is unpickled or copied.
+
+    :param content_class: The class the record's class was made from.
+    :type content_class: type
+    :param requester: :class:`canvasapi.requester.Requester`
+    :param attributes: dict
+    :rtype: :class:`CompactRecord`
+    """
+    return compact_class(content_class)(requester, attributes)
+
+
+def _key_table(names):
+    return dict((name, index) for index, name in enumerate(names))
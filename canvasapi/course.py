@@ -19,6 +19,13 @@ from canvasapi.util import combine_kwargs
 @python_2_unicode_compatible
 class Course(CanvasObject):
 
+    _schema = {
+        'created_at': 'date',
+        'start_at': 'date',
+        'end_at': 'date'
+    }
+    _schema_complete = True
+
     def __str__(self):
         return "{} {} ({})".format(self.course_code, self.name, self.id)
 
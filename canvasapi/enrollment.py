@@ -8,6 +8,17 @@ from canvasapi.canvas_object import CanvasObject
 @python_2_unicode_compatible
 class Enrollment(CanvasObject):
 
+    _schema = {
+        'user': 'canvasapi.user.User',
+        'created_at': 'date',
+        'updated_at': 'date',
+        'start_at': 'date',
+        'end_at': 'date',
+        'last_activity_at': 'date',
+        'last_attended_at': 'date'
+    }
+    _schema_complete = True
+
     def __str__(self):
         return "{} ({})".format(self.type, self.id)
 
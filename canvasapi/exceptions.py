@@ -52,3 +52,8 @@ class RequiredFieldMissing(CanvasException):
 class Forbidden(CanvasException):
     """Canvas has denied access to the resource for this user"""
     pass
+
+
+class RateLimitExceeded(Forbidden):
+    """Canvas has throttled this access token for making too many requests."""
+    pass
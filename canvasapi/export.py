@@ -0,0 +1,335 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+from itertools import islice
+import os
+
+from six import integer_types, string_types, text_type
+
+from canvasapi.canvas_object import DATE_PATTERN, parse_date
+from canvasapi.json_codec import get_codec
+
+#: The number of rows converted to columns at a time.
+BATCH_SIZE = 10000
+
+#: The column types a field can be exported as.
+KINDS = ('date', 'bool', 'int', 'float', 'string', 'json')
+
+
+def to_records(rows, fields=None, batch_size=BATCH_SIZE, codec=None):
+    """
+    Convert JSON objects to a NumPy record array.
+
+    Missing values become `NaT` in date columns, `NaN` in number columns
+    and empty strings in text columns, which hold Python strings so that
+    one long value does not widen every row. A boolean column with missing
+    values is stored as objects. Values that do not fit the kind of their
+    column, such as a string that is not a date in a date column, are
+    treated as missing, except in string columns, where they are encoded
+    as JSON, and fractions in integer columns, which raise `ValueError`.
+
+    :param rows: The JSON objects, as an iterable of dictionaries.
+    :type rows: iterable
+    :param fields: The fields to export, as names or `(name, kind)`
+        pairs where `kind` is one of :data:`KINDS`. The kind of a field
+        given by name is inferred from its first batch of values. Numbers
+        are exported as floats, since fields such as `score` may hold
+        integers at first and fractions later, except for `id` and fields
+        ending in `_id`, which are exported as integers. Declare
+        `(name, 'int')` to keep other integer fields. Defaults to every
+        field of the first batch, so pass the fields explicitly if some
+        only appear in later rows.
+    :type fields: list
+    :param batch_size: The number of rows converted at a time.
+    :type batch_size: int
+    :param codec: The codec used to encode nested JSON values.
+    :type codec: :class:`canvasapi.json_codec.JSONCodec`
+    :rtype: :class:`numpy.recarray`
+    """
+    numpy = _import('numpy', 'NumPy record arrays')
+    codec = codec or get_codec()
+
+    columns = None
+    chunks = None
+    for batch in _batches(rows, batch_size):
+        if columns is None:
+            columns = infer_columns(fields, batch)
+            chunks = [[] for _ in columns]
+        for (name, kind), chunk in zip(columns, chunks):
+            chunk.append(_numpy_array(numpy, kind, _column(name, kind, batch, codec)))
+
+    if columns is None:
+        columns = infer_columns(fields, [])
+        chunks = [[_numpy_array(numpy, kind, [])] for name, kind in columns]
+
+    arrays = [numpy.concatenate(chunk) for chunk in chunks]
+    names = [str(name) for name, _ in columns]
+    if not arrays:
+        return numpy.recarray((0,), dtype=[])
+    return numpy.rec.fromarrays(arrays, names=names)
+
+
+def iter_arrow_batches(rows, fields=None, batch_size=BATCH_SIZE, codec=None):
+    """
+    Convert JSON objects to Arrow record batches, one batch at a time.
+
+    The first batch determines the schema, which is also returned when
+    there are no rows at all.
+
+    :param rows: The JSON objects, as an iterable of dictionaries.
+    :type rows: iterable
+    :param fields: The fields to export. See :func:`to_records`.
+    :type fields: list
+    :param batch_size: The number of rows per batch.
+    :type batch_size: int
+    :param codec: The codec used to encode nested JSON values.
+    :type codec: :class:`canvasapi.json_codec.JSONCodec`
+    :returns: The schema, then each :class:`pyarrow.RecordBatch`.
+    :rtype: iterator
+    """
+    pyarrow = _import('pyarrow', 'Arrow tables')
+    codec = codec or get_codec()
+    batches = _batches(rows, batch_size)
+
+    first = next(batches, [])
+    columns = infer_columns(fields, first)
+    schema = pyarrow.schema([
+        (name, _arrow_type(pyarrow, kind)) for name, kind in columns
+    ])
+    yield schema
+
+    if not first:
+        return
+
+    for batch in _chain_first(first, batches):
+        yield pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(_column(name, kind, batch, codec), type=field.type)
+                for (name, kind), field in zip(columns, schema)
+            ],
+            schema=schema
+        )
+
+
+def to_arrow(rows, fields=None, batch_size=BATCH_SIZE, codec=None):
+    """
+    Convert JSON objects to an Arrow table.
+
+    See :func:`iter_arrow_batches` for the parameters.
+
+    :rtype: :class:`pyarrow.Table`
+    """
+    pyarrow = _import('pyarrow', 'Arrow tables')
+    batches = iter_arrow_batches(rows, fields, batch_size, codec)
+    schema = next(batches)
+    return pyarrow.Table.from_batches(list(batches), schema=schema)
+
+
+def to_parquet(rows, path, fields=None, batch_size=BATCH_SIZE, codec=None, **kwargs):
+    """
+    Write JSON objects to a Parquet file, one batch at a time, so that
+    only one batch is held in memory.
+
+    See :func:`iter_arrow_batches` for the parameters.
+
+    :param path: The path of the file, or a writable file object.
+    :type path: str or file
+    :param kwargs: Options passed to :class:`pyarrow.parquet.ParquetWriter`,
+        such as `compression`.
+    """
+    pyarrow = _import('pyarrow', 'Parquet files')
+    parquet = _import('pyarrow.parquet', 'Parquet files')
+    batches = iter_arrow_batches(rows, fields, batch_size, codec)
+    schema = next(batches)
+
+    writer = parquet.ParquetWriter(path, schema, **kwargs)
+    try:
+        for batch in batches:
+            writer.write_table(pyarrow.Table.from_batches([batch], schema=schema))
+    except Exception:
+        # Don't leave a truncated file behind.
+        writer.close()
+        if isinstance(path, string_types) and os.path.exists(path):
+            os.remove(path)
+        raise
+    writer.close()
+
+
+def write_ndjson(rows, fp, fields=None, codec=None):
+    """
+    Write JSON objects to a file as newline-delimited JSON, one object at
+    a time.
+
+    :param rows: The JSON objects, as an iterable of dictionaries.
+    :type rows: iterable
+    :param fp: A file opened in text mode.
+    :type fp: file
+    :param fields: The names of the fields to write. Defaults to every
+        field.
+    :type fields: list of str
+    :param codec: The codec used to encode each object.
+    :type codec: :class:`canvasapi.json_codec.JSONCodec`
+    :returns: The number of objects written.
+    :rtype: int
+    """
+    dumps = (codec or get_codec()).dumps
+    count = 0
+    for row in rows:
+        if fields is not None:
+            row = dict((name, row[name]) for name in fields if name in row)
+        fp.write(dumps(row))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def infer_columns(fields, batch):
+    """
+    Determine the name and kind of each exported column.
+
+    :param fields: The fields to export. See :func:`to_records`.
+    :type fields: list
+    :param batch: The first rows.
+    :type batch: list of dict
+    :rtype: list of tuple
+    """
+    if fields is None:
+        fields = []
+        seen = set()
+        for row in batch:
+            for name in row:
+                if name not in seen:
+                    seen.add(name)
+                    fields.append(name)
+
+    columns = []
+    for field in fields:
+        if isinstance(field, (list, tuple)):
+            name, kind = field
+            if kind not in KINDS:
+                raise ValueError('Unknown column kind %r. Use one of: %s.' % (
+                    kind,
+                    ', '.join(KINDS)
+                ))
+        else:
+            name, kind = field, _infer_kind(field, (row.get(field) for row in batch))
+        columns.append((name, kind))
+    return columns
+
+
+def _infer_kind(name, values):
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return 'bool'
+        if isinstance(value, integer_types + (float,)):
+            # Canvas identifiers are always integers; other numbers may
+            # hold fractions in later batches.
+            is_id = name == 'id' or name.endswith('_id')
+            return 'int' if is_id and isinstance(value, integer_types) else 'float'
+        if isinstance(value, string_types):
+            return 'date' if DATE_PATTERN.match(value) else 'string'
+        return 'json'
+    return 'string'
+
+
+def _column(name, kind, batch, codec):
+    """
+    Extract the values of a column from a batch of rows, converted to the
+    Python type of its kind, with `None` for missing values and values
+    that do not fit the kind.
+    """
+    values = [row.get(name) for row in batch]
+    if kind == 'date':
+        return [_date(value) for value in values]
+    if kind == 'string':
+        return [
+            None if value is None
+            else text_type(value) if isinstance(value, string_types)
+            else codec.dumps(value)
+            for value in values
+        ]
+    if kind == 'json':
+        return [None if value is None else codec.dumps(value) for value in values]
+    if kind == 'bool':
+        return [value if isinstance(value, bool) else None for value in values]
+
+    numbers = [
+        None if isinstance(value, bool) or not isinstance(value, integer_types + (float,))
+        else value
+        for value in values
+    ]
+    if kind == 'int':
+        for value in numbers:
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError(
+                    'Column %r holds the non-integer %r. Export it as '
+                    '(%r, \'float\').' % (name, value, name)
+                )
+        return [value if value is None else int(value) for value in numbers]
+    return [None if value is None else float(value) for value in numbers]
+
+
+def _date(value):
+    if not isinstance(value, string_types) or not DATE_PATTERN.match(value):
+        return None
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def _numpy_array(numpy, kind, values):
+    if kind == 'date':
+        return numpy.array(
+            [None if value is None else value.replace(tzinfo=None) for value in values],
+            dtype='datetime64[us]'
+        )
+    if kind in ('string', 'json'):
+        # Fixed-width strings would pad every row to the longest value.
+        return numpy.array(['' if value is None else value for value in values], dtype=object)
+
+    if None not in values:
+        return numpy.array(values, dtype={'bool': '?', 'int': 'i8', 'float': 'f8'}[kind])
+    if kind == 'bool':
+        return numpy.array(values, dtype=object)
+    return numpy.array(
+        [float('nan') if value is None else value for value in values],
+        dtype='f8'
+    )
+
+
+def _arrow_type(pyarrow, kind):
+    if kind == 'date':
+        return pyarrow.timestamp('us', tz='UTC')
+    return {
+        'bool': pyarrow.bool_(),
+        'int': pyarrow.int64(),
+        'float': pyarrow.float64(),
+        'string': pyarrow.string(),
+        'json': pyarrow.string(),
+    }[kind]
+
+
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _chain_first(first, rest):
+    yield first
+    for batch in rest:
+        yield batch
+
+
+def _import(module, purpose):
+    try:
+        return __import__(module, fromlist=[str('_')])
+    except ImportError:
+        raise ImportError('%s requires %s, which is not installed.' % (
+            purpose,
+            module.split('.')[0]
+        ))
@@ -0,0 +1,112 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
+
+from six import binary_type, text_type
+
+#: The fields whose string values are interned by default. Each takes only
+#: a few distinct values across a listing.
+INTERNED_FIELDS = frozenset([
+    'enrollment_state',
+    'grading_type',
+    'locale',
+    'role',
+    'state',
+    'submission_type',
+    'time_zone',
+    'type',
+    'workflow_state',
+])
+
+
+class IdentityMap(object):
+    """
+    Deduplicates the entities nested in JSON objects and interns their
+    low-cardinality strings, so that repeated values share memory.
+
+    A nested object with an `id`, such as the `user` included with each
+    enrollment, is keyed on the name of the field holding it and its `id`,
+    since the JSON does not say which type it is. When an equal object has
+    been seen under the same key recently, the first copy is used instead.
+    Only the `max_entities` most recently used entities are kept.
+
+    Field names, and the values of the fields in `interned_fields`, such
+    as `workflow_state`, are replaced by a single shared copy. At most
+    `max_strings` strings are kept, so that memory use stays bounded when
+    the map is used for a long listing.
+    """
+
+    def __init__(
+            self, max_entities=10000, interned_fields=INTERNED_FIELDS, max_strings=10000):
+        """
+        :param max_entities: The number of nested entities to remember.
+        :type max_entities: int
+        :param interned_fields: The names of the fields whose string values
+            are interned.
+        :type interned_fields: set of str
+        :param max_strings: The number of strings to intern.
+        :type max_strings: int
+        """
+        self.max_entities = max_entities
+        self.interned_fields = frozenset(interned_fields)
+        self.max_strings = max_strings
+        self.hits = 0
+
+        self._entities = OrderedDict()
+        self._strings = {}
+
+    def __len__(self):
+        return len(self._entities)
+
+    def dedupe(self, element):
+        """
+        Return a copy of a JSON object whose nested entities and strings
+        are shared with the objects seen before.
+
+        :param element: dict
+        :rtype: dict
+        """
+        return self.__dict(element)
+
+    def clear(self):
+        """
+        Forget every entity and string seen so far.
+        """
+        self._entities.clear()
+        self._strings.clear()
+
+    def __dict(self, element):
+        return dict(
+            (self.__string(name), self.__value(name, value))
+            for name, value in element.items()
+        )
+
+    def __value(self, name, value):
+        if isinstance(value, (text_type, binary_type)):
+            return self.__string(value) if name in self.interned_fields else value
+        if isinstance(value, list):
+            return [self.__value(name, item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        value = self.__dict(value)
+        entity_id = value.get('id')
+        if entity_id is None or isinstance(entity_id, (list, dict)):
+            return value
+
+        key = (name, entity_id)
+        existing = self._entities.pop(key, None)
+        if existing == value:
+            self.hits += 1
+            value = existing
+        elif len(self._entities) >= self.max_entities:
+            self._entities.popitem(last=False)
+        self._entities[key] = value
+        return value
+
+    def __string(self, value):
+        existing = self._strings.get(value)
+        if existing is not None:
+            return existing
+        if len(self._strings) < self.max_strings:
+            self._strings[value] = value
+        return value
@@ -0,0 +1,92 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import json
+
+from six import binary_type, text_type
+
+#: The codecs tried, in order, when the codec is `'auto'`.
+PREFERRED_CODECS = ('orjson', 'ujson', 'json')
+
+
+class JSONCodec(object):
+    """
+    A JSON encoder and decoder pair backed by one JSON library.
+
+    Use :func:`get_codec` to create one.
+    """
+
+    def __init__(self, name, loads, dumps):
+        """
+        :param name: The name of the library.
+        :type name: str
+        :param loads: A function decoding a byte or text string.
+        :type loads: callable
+        :param dumps: A function encoding an object to a text string.
+        :type dumps: callable
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return '<JSONCodec %s>' % (self.name)
+
+    def __reduce__(self):
+        # The built-in codecs use closures, so rebuild them by name instead.
+        if self.name in PREFERRED_CODECS:
+            return (get_codec, (self.name,))
+        return (JSONCodec, (self.name, self.loads, self.dumps))
+
+
+def get_codec(name='auto'):
+    """
+    Return the codec for a JSON library.
+
+    :param name: `'orjson'`, `'ujson'` or `'json'` for the standard library,
+        or `'auto'` for the fastest of these that is installed.
+    :type name: str
+    :raises ImportError: If the requested library is not installed.
+    :rtype: :class:`JSONCodec`
+    """
+    if name == 'auto':
+        for candidate in PREFERRED_CODECS:
+            try:
+                return get_codec(candidate)
+            except ImportError:
+                continue
+
+    if name == 'orjson':
+        import orjson
+
+        def dumps(obj):
+            return orjson.dumps(obj).decode('utf-8')
+
+        return JSONCodec('orjson', orjson.loads, dumps)
+    elif name == 'ujson':
+        import ujson
+
+        def dumps(obj):
+            return _text(ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False))
+
+        return JSONCodec('ujson', ujson.loads, dumps)
+    elif name == 'json':
+        def loads(data):
+            if isinstance(data, binary_type):
+                data = data.decode('utf-8')
+            return json.loads(data)
+
+        def dumps(obj):
+            # Python 2's json.dumps returns a byte string.
+            return _text(json.dumps(obj))
+
+        return JSONCodec('json', loads, dumps)
+
+    raise ValueError('Unknown JSON codec %r. Use one of: auto, %s.' % (
+        name,
+        ', '.join(PREFERRED_CODECS)
+    ))
+
+
+def _text(encoded):
+    if isinstance(encoded, binary_type):
+        return encoded.decode('utf-8')
+    return text_type(encoded)
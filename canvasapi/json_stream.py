@@ -0,0 +1,143 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DELIMITERS = frozenset(' \t\n\r,]')
+
+
+def iter_json_array(chunks, encoding='utf-8', decoder=None):
+    """
+    Incrementally decode a JSON array, yielding each element as soon as
+    enough of the document has been read to decode it.
+
+    Only one element, plus the unread part of the current chunk, is held
+    in memory at a time.
+
+    :param chunks: The document, as an iterable of byte strings.
+    :type chunks: iterable
+    :param encoding: The character encoding of the document.
+    :type encoding: str
+    :param decoder: The decoder used for each element. Defaults to
+        :class:`json.JSONDecoder`.
+    :type decoder: :class:`json.JSONDecoder`
+    :raises ValueError: If the document is not a well-formed JSON array.
+    """
+    decoder = decoder or json.JSONDecoder()
+    reader = _ChunkReader(chunks, encoding)
+
+    if reader.next_token() != '[':
+        raise ValueError('Expected a JSON array.')
+    reader.position += 1
+
+    if reader.next_token() == ']':
+        reader.position += 1
+        reader.expect_end()
+        return
+
+    while True:
+        reader.next_token()
+        yield reader.decode(decoder)
+
+        token = reader.next_token()
+        reader.position += 1
+        if token == ']':
+            reader.expect_end()
+            return
+        if token != ',':
+            raise ValueError('Expected "," or "]" at position %s.' % (reader.offset))
+
+
+class _ChunkReader(object):
+    """
+    A text buffer over an iterable of byte chunks which reads more data
+    only when needed.
+    """
+
+    def __init__(self, chunks, encoding):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ''
+        self.position = 0
+        self.consumed = 0
+        self.eof = False
+
+    @property
+    def offset(self):
+        return self.consumed + self.position
+
+    def read(self):
+        """
+        Append the next chunk to the buffer, discarding what has already
+        been consumed.
+
+        :returns: `False` once the end of the document has been reached.
+        :rtype: bool
+        """
+        if self.eof:
+            return False
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self.decoder.decode(b'', final=True)
+        else:
+            text = self.decoder.decode(chunk)
+
+        self.consumed += self.position
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        return True
+
+    def next_token(self):
+        """
+        Skip whitespace and return the next character without consuming
+        it, or an empty string at the end of the document.
+
+        :rtype: str
+        """
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read():
+                return ''
+
+    def decode(self, decoder):
+        """
+        Decode the value starting at the current position.
+
+        A value that is not followed by a delimiter may have been cut short
+        (for example a number split across chunks), so it is only accepted
+        once more data has been read or the document has ended.
+        """
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.position)
+            except ValueError:
+                if not self._read_more():
+                    raise
+                continue
+
+            truncated = end == len(self.buffer) or self.buffer[end] not in DELIMITERS
+            if truncated and self.read():
+                continue
+
+            self.position = end
+            return value
+
+    def _read_more(self):
+        # Read until the buffer has doubled so that decoding a value larger
+        # than one chunk is retried a logarithmic number of times.
+        target = 2 * (len(self.buffer) - self.position)
+        read = False
+        while self.read():
+            read = True
+            if len(self.buffer) - self.position >= target:
+                break
+        return read
+
+    def expect_end(self):
+        if self.next_token() != '':
+            raise ValueError('Unexpected data after JSON array at position %s.' % (self.offset))
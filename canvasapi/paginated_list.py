@@ -1,5 +1,18 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
-import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from six.moves.urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from canvasapi import export
+from canvasapi.canvas_object import compact_class
+from canvasapi.exceptions import CanvasException
+from canvasapi.identity_map import IdentityMap
+from canvasapi.json_stream import iter_json_array
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class PaginatedList(object):
@@ -10,9 +23,64 @@ class PaginatedList(object):
 
     def __init__(
         self, content_class, requester, request_method, first_url, extra_attribs=None,
-            **kwargs):
-
+            concurrency=None, stream_json=None, compact=None, raw=None, retain=True,
+            fields=None, identity_map=None, **kwargs):
+        """
+        :param content_class: The class to build each element with.
+        :type content_class: type
+        :param requester: The requester to pass HTTP requests through.
+        :type requester: :class:`canvasapi.requester.Requester`
+        :param request_method: The HTTP method used to fetch each page.
+        :type request_method: str
+        :param first_url: The endpoint of the first page.
+        :type first_url: str
+        :param extra_attribs: Attributes added to every element.
+        :type extra_attribs: dict
+        :param concurrency: The number of pages to fetch in parallel once
+            the number of the last page is known from the `Link` header.
+            Elements are still returned in order. Defaults to the
+            requester's `page_concurrency`.
+        :type concurrency: int
+        :param stream_json: Whether to decode each page incrementally as it
+            is downloaded, building and returning elements one at a time
+            instead of after the whole page has been read. Defaults to the
+            requester's `stream_json`.
+        :type stream_json: bool
+        :param compact: Whether to build each element as a
+            :class:`canvasapi.canvas_object.CompactRecord`, which stores its
+            fields in a tuple instead of a dictionary. Defaults to the
+            requester's `compact_records`.
+        :type compact: bool
+        :param raw: Whether to return each element as the dictionary
+            decoded from the response, without building an object or adding
+            `extra_attribs`. Elements can be converted later with
+            :func:`upgrade`. Defaults to the requester's `raw_lists`.
+        :type raw: bool
+        :param retain: Whether to keep the elements that have been iterated
+            over, so that the list can be iterated again. If `False`,
+            iterating behaves like :func:`stream`.
+        :type retain: bool
+        :param fields: The names of the fields to keep on each element. The
+            other fields are dropped before the element is built, so no
+            attribute, including `*_date` attributes, is created for them.
+            `extra_attribs` are always kept. Defaults to the entry for the
+            content class in the requester's `list_fields`, or to every
+            field.
+        :type fields: list of str
+        :param identity_map: A map shared with other lists, or `True` to
+            give this list its own, through which nested entities and
+            low-cardinality strings repeated across elements are
+            deduplicated. Defaults to
+            the requester's `identity_map`.
+        :type identity_map: :class:`canvasapi.identity_map.IdentityMap` or bool
+        """
+        # The elements read so far, starting at index `__offset`. Those
+        # before index `__discarded` have been yielded by stream() and are
+        # replaced by None until the front of the list is trimmed.
         self.__elements = list()
+        self.__offset = 0
+        self.__discarded = 0
+        self.__retain = retain
 
         self.__requester = requester
         self.__content_class = content_class
@@ -24,63 +92,638 @@ class PaginatedList(object):
         self.__extra_attribs = extra_attribs or {}
         self.__request_method = request_method
 
+        if concurrency is None:
+            concurrency = requester.page_concurrency
+        self.__concurrency = concurrency
+        self.__executor = None
+        self.__pending_urls = None
+        self.__page_futures = deque()
+
+        if stream_json is None:
+            stream_json = requester.stream_json
+        self.__stream_json = stream_json
+        self.__page = None
+        self.__page_url = None
+        self.__page_params = None
+        self.__page_read = 0
+        self.__skip = 0
+        self.__last_url = None
+        self.__last_elements = None
+        self.__last_start = None
+        self.__count = None
+
+        if compact is None:
+            compact = requester.compact_records
+        self.__compact_class = compact_class(content_class) if compact else None
+        self.__key_tables = {}
+
+        if raw is None:
+            raw = requester.raw_lists
+        self.__raw = raw
+
+        if fields is None:
+            fields = (requester.list_fields or {}).get(content_class.__name__)
+        self.__fields = tuple(fields) if fields is not None else None
+
+        if identity_map is None:
+            identity_map = requester.identity_map
+        if identity_map is True:
+            identity_map = IdentityMap()
+        elif identity_map is False:
+            identity_map = None
+        self.__identity_map = identity_map
+
     def __getitem__(self, index):
         assert isinstance(index, (int, slice))
         if isinstance(index, int):
+            if index < 0:
+                index += self.total_count()
+                if index < 0:
+                    raise IndexError('Index out of range.')
+                if self.__last_start is not None and index >= self.__last_start:
+                    return self.__last_elements[index - self.__last_start]
+            if index < self.__discarded:
+                raise IndexError('Element %s has already been discarded.' % (index))
             self.__get_up_to_index(index)
-            return self.__elements[index]
+            return self.__elements[index - self.__offset]
         else:
             return self._Slice(self, index)
 
+    def __len__(self):
+        count = self.__count_from_links() if self.__retain else None
+        if count is None:
+            raise TypeError(
+                'The length of this list is only known once every page has been '
+                'read. Use total_count() to read them.'
+            )
+        return count
+
+    def __bool__(self):
+        self.__get_up_to_index(0)
+        return self.__offset + len(self.__elements) > 0
+
+    __nonzero__ = __bool__
+
     def __iter__(self):
-        for element in self.__elements:
+        if not self.__retain:
+            for element in self.stream():
+                yield element
+            return
+
+        for element in islice(self.__elements, self.__discarded - self.__offset, None):
             yield element
         while self._has_next():
-            new_elements = self._grow()
-            for element in new_elements:
+            for element in self._grow_incrementally():
                 yield element
 
     def __repr__(self):
         return "<PaginatedList of type %s>" % (self.__content_class.__name__)
 
+    @classmethod
+    def from_cursor(cls, content_class, requester, cursor, **kwargs):
+        """
+        Create a list resuming at the position saved in a cursor.
+
+        Indices in the new list are the same as in the original one, and
+        the elements before the cursor are treated as discarded.
+
+        :param content_class: The class to build each element with.
+        :type content_class: type
+        :param requester: The requester to pass HTTP requests through.
+        :type requester: :class:`canvasapi.requester.Requester`
+        :param cursor: A value of :attr:`cursor`.
+        :type cursor: dict
+        :param kwargs: Options passed to :class:`PaginatedList`, such as
+            `concurrency` or `retain`.
+        :rtype: :class:`PaginatedList`
+        """
+        paginated_list = cls(
+            content_class,
+            requester,
+            cursor['method'],
+            cursor['url'],
+            cursor.get('extra_attribs'),
+            **kwargs
+        )
+
+        params = dict(cursor['params'])
+        if '_kwargs' in params:
+            params['_kwargs'] = [tuple(pair) for pair in params['_kwargs']]
+        paginated_list.__next_params = params
+        paginated_list.__offset = cursor['index'] - cursor['skip']
+        paginated_list.__discarded = paginated_list.__offset
+        paginated_list.__skip = cursor['skip']
+        return paginated_list
+
+    @property
+    def cursor(self):
+        """
+        The position after the last element read from Canvas, as a
+        dictionary that can be serialized to JSON and passed to
+        :func:`from_cursor` to resume reading in another process.
+
+        When iterating with :func:`stream`, or with `retain=False`, this is
+        the position after the last element yielded.
+
+        :rtype: dict
+        """
+        index = self.__offset + len(self.__elements)
+        if self.__page is not None:
+            url, params, skip = self.__page_url, self.__page_params, self.__page_read
+        else:
+            url, params, skip = self.__next_url, self.__next_params, self.__skip
+            index += self.__skip
+
+        return {
+            'method': self.__request_method,
+            'url': url,
+            'params': _serializable_params(params),
+            'skip': skip,
+            'index': index,
+            'extra_attribs': dict(self.__extra_attribs),
+        }
+
+    def upgrade(self, element):
+        """
+        Build the object for an element returned in raw mode, as it would
+        have been returned otherwise.
+
+        :param element: A dictionary returned by this list.
+        :type element: dict
+        :returns: An instance of this list's content class.
+        """
+        attributes = dict(element)
+        attributes.update(self.__extra_attribs)
+        return self.__build_element(attributes)
+
+    def stream(self):
+        """
+        Iterate over the elements that have not been discarded yet,
+        discarding each one as soon as it has been yielded, so that only
+        the page being read is held in memory.
+
+        Iteration can be stopped and resumed: a later call continues
+        after the last element yielded. Those elements can no longer be
+        indexed.
+        """
+        while self.__discarded < self.__offset + len(self.__elements) or self._has_next():
+            if self.__discarded < self.__offset + len(self.__elements):
+                yield self.__discard_next()
+            else:
+                for element in self._grow_incrementally(retain=False):
+                    yield element
+
+    def __discard_next(self):
+        """
+        Discard the first element read but not discarded yet, and return it.
+
+        The front of the list is only trimmed once at least half of it has
+        been discarded, so that discarding each element takes constant time
+        on average.
+        """
+        position = self.__discarded - self.__offset
+        element = self.__elements[position]
+        self.__elements[position] = None
+        self.__discarded += 1
+
+        if 2 * (position + 1) >= len(self.__elements):
+            del self.__elements[:position + 1]
+            self.__offset = self.__discarded
+        return element
+
+    def to_records(self, fields=None, batch_size=export.BATCH_SIZE):
+        """
+        Export the elements not discarded yet to a NumPy record array.
+
+        The pages are read as JSON and converted to columns in batches,
+        without building objects. Fields that hold dates become
+        `datetime64` columns. Requires NumPy.
+
+        :param fields: The fields to export, as names or `(name, kind)`
+            pairs. See :func:`canvasapi.export.to_records`.
+        :type fields: list
+        :param batch_size: The number of rows converted at a time.
+        :type batch_size: int
+        :rtype: :class:`numpy.recarray`
+        """
+        return export.to_records(
+            self.__export_rows(fields),
+            fields,
+            batch_size,
+            self.__requester.json_codec
+        )
+
+    def to_arrow(self, fields=None, batch_size=export.BATCH_SIZE):
+        """
+        Export the elements not discarded yet to an Arrow table, with
+        timestamp columns for fields that hold dates. Requires PyArrow.
+
+        See :func:`to_records` for the parameters.
+
+        :rtype: :class:`pyarrow.Table`
+        """
+        return export.to_arrow(
+            self.__export_rows(fields),
+            fields,
+            batch_size,
+            self.__requester.json_codec
+        )
+
+    def to_parquet(self, path, fields=None, batch_size=export.BATCH_SIZE, **kwargs):
+        """
+        Write the elements not discarded yet to a Parquet file. Only one
+        page and one batch of columns are held in memory at a time.
+        Requires PyArrow.
+
+        See :func:`to_records` for the parameters.
+
+        :param path: The path of the file, or a writable file object.
+        :type path: str or file
+        :param kwargs: Options passed to :class:`pyarrow.parquet.ParquetWriter`.
+        """
+        export.to_parquet(
+            self.__export_rows(fields),
+            path,
+            fields,
+            batch_size,
+            self.__requester.json_codec,
+            **kwargs
+        )
+
+    def write_ndjson(self, fp, fields=None):
+        """
+        Write the elements not discarded yet to a file as newline-delimited
+        JSON, one element per line. The pages are read as JSON and written
+        element by element without building objects, so memory use does
+        not grow with the size of the list.
+
+        :param fp: A file opened in text mode.
+        :type fp: file
+        :param fields: The names of the fields to write. Defaults to every
+            field.
+        :type fields: list of str
+        :returns: The number of elements written.
+        :rtype: int
+        """
+        return export.write_ndjson(
+            self.__export_rows(fields),
+            fp,
+            fields,
+            self.__requester.json_codec
+        )
+
+    def __export_rows(self, fields=None):
+        """
+        Iterate over the JSON of the elements not discarded yet, with
+        `extra_attribs` merged in. Pages not read yet are fetched by a
+        separate list, in raw mode, so this list is left unchanged.
+
+        :param fields: The fields that will be exported, to drop the others
+            as soon as each page is decoded.
+        :type fields: list
+        """
+        for element in islice(self.__elements, self.__discarded - self.__offset, None):
+            row = dict(element if self.__raw else element.attributes)
+            row.update(self.__extra_attribs)
+            yield row
+
+        if not self._has_next():
+            return
+
+        if fields is not None:
+            fields = [
+                field[0] if isinstance(field, (list, tuple)) else field for field in fields
+            ]
+        elif self.__fields is not None:
+            fields = self.__fields
+
+        for row in self.__remaining(fields):
+            row.update(self.__extra_attribs)
+            yield row
+
+    def __remaining(self, fields):
+        """
+        Return a separate list of the pages not read yet, which returns
+        the elements in raw mode and discards them as they are read, so
+        that this list is left unchanged.
+
+        :param fields: The fields to keep on each element.
+        :type fields: list
+        :rtype: :class:`PaginatedList`
+        """
+        return PaginatedList.from_cursor(
+            self.__content_class,
+            self.__requester,
+            self.cursor,
+            concurrency=self.__concurrency,
+            stream_json=self.__stream_json,
+            raw=True,
+            retain=False,
+            fields=fields,
+            identity_map=False
+        )
+
+    def total_count(self):
+        """
+        Return the number of elements in the list, including those already
+        discarded.
+
+        If Canvas returns a `last` link addressed by page number, the count
+        is computed from the number of the last page and the number of
+        elements on it, which takes at most two requests. The last page is
+        kept, so that it is not requested again and negative indices can
+        be read from it. Otherwise, every page is read. If the list does
+        not retain its elements, those pages are counted without keeping
+        their elements, so they are requested again when iterating.
+
+        `len()` returns the same count, but only when it can be computed
+        from the `last` link and the list retains its elements; otherwise it
+        raises `TypeError`, so that `list()` does not read every page twice.
+        Since `list()` asks for the length of the list first, converting a
+        list with a `last` link reads the last page before the second.
+
+        :rtype: int
+        """
+        count = self.__count_from_links()
+        if count is not None:
+            return count
+
+        if not self.__retain:
+            if self.__count is None:
+                remaining = self.__remaining(())
+                for _ in remaining:
+                    pass
+                self.__count = remaining.cursor['index']
+            return self.__count
+
+        while self._has_next():
+            self._grow()
+        return self.__offset + len(self.__elements)
+
+    def __count_from_links(self):
+        """
+        Return the number of elements in the list if it is known without
+        reading every page, or `None`.
+
+        :rtype: int
+        """
+        # Read the first page for its links, but only once: without a
+        # `last` link, later pages can only be counted by reading them.
+        if self.__page_url is None and not self.__elements and self._has_next():
+            self._grow()
+
+        if not self._has_next():
+            return self.__offset + len(self.__elements)
+
+        if self.__last_elements is None:
+            self.__get_last_page()
+        if self.__last_elements is not None:
+            return self.__last_start + len(self.__last_elements)
+        return None
+
+    def __get_last_page(self):
+        """
+        Fetch the page addressed by the `last` link if the number of
+        elements before it can be computed from its `page` and `per_page`
+        parameters.
+        """
+        if self.__last_url is None:
+            return
+
+        last_page = _page_number(self.__last_url)
+        per_page = _query_int(self.__last_url, 'per_page')
+        if last_page is None or per_page is None:
+            return
+
+        for url, future in self.__page_futures:
+            if url == self.__last_url:
+                response = future.result()
+                break
+        else:
+            response = self.__request(self.__last_url)
+        self.__last_elements = list(self.__build_elements(response.json()))
+        self.__last_start = (last_page - 1) * per_page
+
+    def _retains_elements(self):
+        return self.__retain
+
+    def _stream_slice(self, start, stop, step):
+        """
+        Iterate over a slice of the elements not discarded yet, discarding
+        every element up to the last one yielded.
+        """
+        if start < self.__discarded:
+            raise IndexError('Element %s has already been discarded.' % (start))
+        if stop is not None:
+            stop = max(stop - self.__discarded, 0)
+        return islice(self.stream(), start - self.__discarded, stop, step)
+
     def _is_larger_than(self, index):
-        return len(self.__elements) > index or self._has_next()
+        self.__get_up_to_index(index)
+        return len(self.__elements) + self.__offset > index
 
     def __get_up_to_index(self, index):
-        while len(self.__elements) <= index and self._has_next():
+        while len(self.__elements) + self.__offset <= index and self._has_next():
             self._grow()
 
     def _grow(self):
-        new_elements = self._get_next_page()
-        self.__elements += new_elements
-        return new_elements
+        return list(self._grow_incrementally())
+
+    def _grow_incrementally(self, retain=True):
+        """
+        Add the elements of the next page, or the remainder of the page
+        being decoded, yielding each one as soon as it has been added.
+
+        :param retain: Whether to keep the elements, or only count them as
+            discarded.
+        :type retain: bool
+        """
+        if self.__page is None:
+            self.__page = self._get_next_page()
+            self.__page_read = 0
+            if self.__skip:
+                self.__page = islice(self.__page, self.__skip, None)
+                self.__page_read, self.__offset = self.__skip, self.__offset + self.__skip
+                self.__discarded = self.__offset
+                self.__skip = 0
+
+        for element in self.__page:
+            self.__page_read += 1
+            if retain:
+                self.__elements.append(element)
+            else:
+                self.__offset += 1
+                self.__discarded = self.__offset
+            yield element
+
+        self.__page = None
 
     def _has_next(self):
-        return self.__next_url is not None
+        return self.__page is not None or self.__next_url is not None
 
     def _get_next_page(self):
-        response = self.__requester.request(
-            self.__request_method,
-            self.__next_url,
-            **self.__next_params
-        )
-        data = response.json()
-        self.__next_url = None
+        self.__page_url, self.__page_params = self.__next_url, self.__next_params
+
+        if self.__last_elements is not None and self.__next_url == self.__last_url:
+            # The last page has been read already, by itself or from its
+            # prefetched response.
+            if self.__page_futures:
+                self.__page_futures.popleft()
+                self.__submit_pages()
+            self.__next_url = None
+            self.__next_params = {}
+            return iter(self.__last_elements)
+
+        if self.__page_futures:
+            _, future = self.__page_futures[0]
+            response = future.result()
+            self.__page_futures.popleft()
+            self.__submit_pages()
+            self.__next_url = self.__page_futures[0][0] if self.__page_futures else None
+        else:
+            response = self.__request(self.__next_url, **self.__next_params)
+            self.__next_url = None
+
+            next_link = response.links.get('next')
+            self.__next_url = self.__endpoint(next_link['url']) if next_link else None
+
+            last_link = response.links.get('last')
+            if last_link:
+                self.__last_url = self.__endpoint(last_link['url'])
+
+            self.__next_params = {}
+
+            if self.__next_url and self.__concurrency > 1:
+                self.__prefetch_pages(response)
 
-        next_link = response.links.get('next')
-        regex = r'%s(.*)' % (re.escape(self.__requester.base_url))
+        if self.__stream_json:
+            data = iter_json_array(
+                response.iter_content(STREAM_CHUNK_SIZE),
+                encoding=response.encoding or 'utf-8'
+            )
+            return self.__build_elements(data)
 
-        self.__next_url = re.search(regex, next_link['url']).group(1) if next_link else None
+        return iter(list(self.__build_elements(response.json())))
 
-        self.__next_params = {}
+    def __build_elements(self, data):
+        fields = self.__fields
+        if fields is not None:
+            data = (
+                dict((name, element[name]) for name in fields if name in element)
+                for element in data if element is not None
+            )
+
+        identity_map = self.__identity_map
+        if identity_map is not None:
+            data = (identity_map.dedupe(element) for element in data if element is not None)
+
+        if self.__raw:
+            for element in data:
+                if element is not None:
+                    yield element
+            return
 
-        content = []
         for element in data:
             if element is not None:
                 element.update(self.__extra_attribs)
-                content.append(self.__content_class(self.__requester, element))
+                yield self.__build_element(element)
+
+    def __build_element(self, attributes):
+        if self.__compact_class is not None:
+            return self.__compact_class(self.__requester, attributes, self.__key_tables)
+        return self.__content_class(self.__requester, attributes)
+
+    def __endpoint(self, url):
+        """
+        Strip the requester's base URL from a pagination link. Links to
+        another host or scheme are kept whole.
+
+        :param url: str
+        :raises CanvasException: If the link would downgrade an HTTPS
+            connection to HTTP.
+        :rtype: str
+        """
+        base_url = self.__requester.base_url
+        if url.startswith(base_url):
+            return url[len(base_url):]
+
+        if urlsplit(base_url).scheme == 'https' and urlsplit(url).scheme != 'https':
+            raise CanvasException(
+                'Refusing to follow the pagination link %s, which is not served '
+                'over HTTPS.' % (url)
+            )
+        return url
+
+    def __request(self, url, **kwargs):
+        """
+        Fetch a page from an endpoint, or from a full URL returned by
+        :func:`__endpoint` for a link outside the requester's base URL.
+        The access token is only sent with a full URL if it has the same
+        scheme and host as the base URL.
+
+        :param url: str
+        :rtype: :class:`requests.Response`
+        """
+        if _is_absolute(url):
+            kwargs['_url'] = url
+            kwargs['use_auth'] = _same_origin(url, self.__requester.base_url)
+            url = None
+
+        return self.__requester.request(
+            self.__request_method,
+            url,
+            _stream=self.__stream_json,
+            **kwargs
+        )
+
+    def __prefetch_pages(self, response):
+        """
+        Start fetching the remaining pages in parallel if they are
+        addressed by page number.
+
+        :param response: The response containing the `next` and `last` links.
+        :type response: :class:`requests.Response`
+        """
+        last_link = response.links.get('last')
+        if not last_link:
+            return
+
+        next_url = response.links['next']['url']
+        next_page = _page_number(next_url)
+        last_page = _page_number(last_link['url'])
+        if next_page is None or last_page is None:
+            return
+
+        self.__pending_urls = (
+            self.__next_url if page == next_page
+            else self.__last_url if page == last_page
+            else self.__endpoint(_with_page_number(next_url, page))
+            for page in range(next_page, last_page + 1)
+        )
+        self.__executor = ThreadPoolExecutor(max_workers=self.__concurrency)
+        self.__submit_pages()
+
+    def __submit_pages(self):
+        """
+        Keep up to `concurrency` page requests in flight.
+        """
+        while self.__pending_urls and len(self.__page_futures) < self.__concurrency:
+            url = next(self.__pending_urls, None)
+            if url is None:
+                self.__pending_urls = None
+                break
 
-        return content
+            if url == self.__last_url and self.__last_elements is not None:
+                # Keep the last page's place without requesting it again.
+                self.__page_futures.append((url, None))
+                continue
+
+            future = self.__executor.submit(self.__request, url)
+            self.__page_futures.append((url, future))
+
+        if not self.__page_futures and self.__executor:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
 
     class _Slice(object):
         def __init__(self, the_list, the_slice):
@@ -90,11 +733,108 @@ class PaginatedList(object):
             self.__step = the_slice.step or 1
 
         def __iter__(self):
+            if self.__start < 0 or (self.__stop is not None and self.__stop < 0):
+                self.__start, self.__stop, _ = slice(self.__start, self.__stop).indices(
+                    self.__list.total_count()
+                )
+
+            if not self.__list._retains_elements():
+                stream = self.__list._stream_slice(self.__start, self.__stop, self.__step)
+                for element in stream:
+                    yield element
+                return
+
             index = self.__start
             while not self.__finished(index):
-                if self.__list._is_larger_than(index):
-                    yield self.__list[index]
-                    index += self.__step
+                if not self.__list._is_larger_than(index):
+                    return
+                yield self.__list[index]
+                index += self.__step
 
         def __finished(self, index):
             return self.__stop is not None and index >= self.__stop
+
+
+def _is_absolute(url):
+    """
+    Return whether a URL includes a scheme and host.
+
+    :param url: str
+    :rtype: bool
+    """
+    return url.startswith(('http://', 'https://'))
+
+
+def _serializable_params(params):
+    """
+    Copy the parameters of a request, with dates converted to ISO 8601
+    strings as the requester sends them, so that they can be serialized
+    to JSON.
+
+    :param params: dict
+    :rtype: dict
+    """
+    def convert(value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    params = dict((name, convert(value)) for name, value in params.items())
+    if '_kwargs' in params:
+        params['_kwargs'] = [(name, convert(value)) for name, value in params['_kwargs']]
+    return params
+
+
+def _same_origin(url, other):
+    """
+    Return whether two URLs have the same scheme and host.
+
+    :param url: str
+    :param other: str
+    :rtype: bool
+    """
+    url, other = urlsplit(url), urlsplit(other)
+    return (url.scheme, url.netloc.lower()) == (other.scheme, other.netloc.lower())
+
+
+def _page_number(url):
+    """
+    Return the numeric `page` parameter of a pagination link, or `None`
+    if the link does not use page numbers.
+
+    :param url: str
+    :rtype: int
+    """
+    return _query_int(url, 'page')
+
+
+def _query_int(url, name):
+    """
+    Return the value of a numeric query parameter of a URL, or `None` if
+    it is missing or not a number.
+
+    :param url: str
+    :param name: str
+    :rtype: int
+    """
+    for key, value in parse_qsl(urlsplit(url).query):
+        if key == name:
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+def _with_page_number(url, page):
+    """
+    Return a copy of a pagination link pointing at a different page.
+
+    :param url: str
+    :param page: int
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    query = [
+        (key, str(page) if key == 'page' else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
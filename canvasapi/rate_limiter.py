@@ -0,0 +1,132 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Paces requests to stay under the Canvas API's throttling quota.
+
+    Canvas throttles each access token with a leaky bucket. Every response
+    reports the quota left in the `X-Rate-Limit-Remaining` header and the
+    cost of the request in the `X-Request-Cost` header. The limiter keeps an
+    estimate of the remaining quota, reserves the expected cost of each
+    request before it is sent, and delays requests that would take the
+    quota below `threshold`. One limiter may be shared by any number of
+    threads.
+    """
+
+    def __init__(
+            self, threshold=50.0, leak_rate=10.0, max_delay=30.0,
+            clock=time.time, sleep=time.sleep):
+        """
+        :param threshold: The amount of quota to keep in reserve.
+        :type threshold: float
+        :param leak_rate: The rate, in units per second, at which Canvas
+            restores quota.
+        :type leak_rate: float
+        :param max_delay: The longest a single request will be delayed, in
+            seconds.
+        :type max_delay: float
+        :param clock: A function returning the current time in seconds.
+        :type clock: callable
+        :param sleep: A function that blocks for a number of seconds.
+        :type sleep: callable
+        """
+        self.threshold = threshold
+        self.leak_rate = leak_rate
+        self.max_delay = max_delay
+        self.total_delay = 0.0
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._remaining = None
+        self._updated_at = None
+        self._cost = 0.0
+        self._reserved = 0.0
+
+    def __getstate__(self):
+        # Locks cannot be copied or pickled; __setstate__ creates a new one.
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        """
+        The estimated quota currently available, or `None` if Canvas has
+        not reported one yet.
+
+        :rtype: float
+        """
+        with self._lock:
+            return self._available(self._clock())
+
+    def acquire(self):
+        """
+        Block until a request can be sent without exhausting the quota.
+
+        :returns: The cost reserved for the request. Pass it back to
+            :func:`update` once the response arrives.
+        :rtype: float
+        """
+        with self._lock:
+            cost = self._cost
+            available = self._available(self._clock())
+            delay = 0.0
+            if available is not None:
+                deficit = self.threshold + cost - available
+                if deficit > 0:
+                    delay = min(deficit / self.leak_rate, self.max_delay)
+            self._reserved += cost
+            self.total_delay += delay
+
+        if delay > 0:
+            self._sleep(delay)
+
+        return cost
+
+    def update(self, reserved, headers=None):
+        """
+        Release a reservation and record the throttling state reported by
+        Canvas.
+
+        :param reserved: The value returned by :func:`acquire`.
+        :type reserved: float
+        :param headers: The headers of the response, or `None` if the
+            request failed before a response was received.
+        :type headers: dict
+        """
+        headers = headers or {}
+        with self._lock:
+            self._reserved = max(self._reserved - reserved, 0.0)
+
+            remaining = headers.get('X-Rate-Limit-Remaining')
+            if remaining is not None:
+                self._remaining = float(remaining)
+                self._updated_at = self._clock()
+
+            cost = headers.get('X-Request-Cost')
+            if cost is not None:
+                cost = float(cost)
+                self._cost = cost if not self._cost else 0.8 * self._cost + 0.2 * cost
+
+    def throttled(self):
+        """
+        Record that Canvas rejected a request for exceeding the quota.
+        Subsequent requests wait until the quota has recovered.
+        """
+        with self._lock:
+            self._remaining = 0.0
+            self._updated_at = self._clock()
+
+    def _available(self, now):
+        if self._remaining is None:
+            return None
+        recovered = (now - self._updated_at) * self.leak_rate
+        return self._remaining + recovered - self._reserved
@@ -1,33 +1,211 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 from datetime import datetime
+import functools
+import threading
+import weakref
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from canvasapi.cache import ResponseCache
 from canvasapi.exceptions import (
     BadRequest, CanvasException, Forbidden, InvalidAccessToken,
-    ResourceDoesNotExist, Unauthorized
+    RateLimitExceeded, ResourceDoesNotExist, Unauthorized
 )
+from canvasapi.json_codec import JSONCodec, get_codec
+from canvasapi.retry import Retry, is_throttled
 
 
 class Requester(object):
     """
     Responsible for handling HTTP requests.
+
+    A requester may be shared by any number of threads. Arguments passed to
+    :func:`request` are never modified, and connections are drawn either
+    from one shared pool or, with `session_per_thread`, from a separate
+    session for each thread.
     """
 
-    def __init__(self, base_url, access_token):
+    def __init__(
+            self, base_url, access_token, page_concurrency=1, rate_limiter=None,
+            retry=None, session=None, adapter=None, pool_connections=10,
+            pool_maxsize=10, pool_block=False, timeout=None, session_per_thread=False,
+            cache=None, coalesce_requests=False, stream_json=False, json_codec='auto',
+            lazy_attributes=False, compact_records=False, raw_lists=False,
+            list_fields=None, identity_map=None, typed_attributes=False):
         """
         :param base_url: The base URL of the Canvas instance's API.
         :type base_url: str
         :param access_token: The API key to authenticate requests with.
         :type access_token: str
+        :param page_concurrency: The default number of pages a
+            :class:`canvasapi.paginated_list.PaginatedList` may fetch
+            in parallel. Defaults to `1`, which fetches pages one at a time.
+        :type page_concurrency: int
+        :param rate_limiter: An optional limiter used to pace requests
+            according to the throttling headers returned by Canvas.
+        :type rate_limiter: :class:`canvasapi.rate_limiter.RateLimiter`
+        :param retry: An optional policy for retrying requests that fail
+            for transient reasons. An int is taken as the maximum number
+            of retries with the default policy, and `True` as the default
+            policy.
+        :type retry: :class:`canvasapi.retry.Retry`, int or bool
+        :param session: An optional session to send requests through. If
+            omitted, a new session is created.
+        :type session: :class:`requests.Session`
+        :param adapter: An optional transport adapter to mount for HTTP and
+            HTTPS URLs. If omitted and no `session` is provided, an adapter
+            is created from the pool options below.
+        :type adapter: :class:`requests.adapters.BaseAdapter`
+        :param pool_connections: The number of hosts to keep connection
+            pools for.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections kept open
+            per host. Set this to at least the number of threads sharing
+            the requester.
+        :type pool_maxsize: int
+        :param pool_block: Whether to wait for a free connection when the
+            pool is exhausted instead of opening a connection that will be
+            discarded afterwards.
+        :type pool_block: bool
+        :param timeout: How long to wait for the server, in seconds. Either
+            a single value or a `(connect, read)` tuple. Defaults to waiting
+            indefinitely.
+        :type timeout: float or tuple
+        :param session_per_thread: Whether to give each thread its own
+            session and connection pool instead of sharing one. Cannot be
+            combined with `session`.
+        :type session_per_thread: bool
+        :param cache: An optional cache for successful `GET` responses.
+            Cached entries below an endpoint are invalidated whenever a
+            `POST`, `PUT` or `DELETE` request to it succeeds.
+        :type cache: :class:`canvasapi.cache.ResponseCache`
+        :param coalesce_requests: Whether identical `GET` requests made
+            by several threads at the same time should share one HTTP
+            request. Every caller receives the same response, or the same
+            exception.
+        :type coalesce_requests: bool
+        :param stream_json: Whether a :class:`canvasapi.paginated_list.PaginatedList`
+            decodes each page incrementally by default.
+        :type stream_json: bool
+        :param json_codec: The JSON library used to decode responses and
+            encode :func:`canvasapi.canvas_object.CanvasObject.to_json`:
+            `'orjson'`, `'ujson'`, `'json'`, or `'auto'` to use the fastest
+            one installed.
+        :type json_codec: str or :class:`canvasapi.json_codec.JSONCodec`
+        :param lazy_attributes: Whether objects keep the JSON they are built
+            from and only convert an attribute, including the `*_date`
+            attributes, the first time it is read.
+        :type lazy_attributes: bool
+        :param compact_records: Whether a :class:`canvasapi.paginated_list.PaginatedList`
+            builds compact, tuple-backed elements by default.
+        :type compact_records: bool
+        :param raw_lists: Whether a :class:`canvasapi.paginated_list.PaginatedList`
+            returns the decoded JSON dictionaries instead of objects by default.
+        :type raw_lists: bool
+        :param list_fields: The fields a :class:`canvasapi.paginated_list.PaginatedList`
+            keeps on its elements by default, as a dictionary mapping class
+            names such as `'User'` to lists of field names. Classes that
+            are not listed keep every field.
+        :type list_fields: dict
+        :param identity_map: Whether a :class:`canvasapi.paginated_list.PaginatedList`
+            deduplicates repeated nested entities and strings by default:
+            `True` for a separate map per list, or a map to share between
+            lists.
+        :type identity_map: :class:`canvasapi.identity_map.IdentityMap` or bool
+        :param typed_attributes: Whether objects convert the fields declared
+            in their class's `_schema`, building nested objects such as the
+            :class:`canvasapi.user.User` of an enrollment.
+        :type typed_attributes: bool
         """
         self.base_url = base_url
         self.access_token = access_token
-        self._session = requests.Session()
+        self.page_concurrency = page_concurrency
+        self.rate_limiter = rate_limiter
+        if isinstance(retry, bool):
+            retry = Retry() if retry else None
+        elif isinstance(retry, int):
+            retry = Retry(total=retry)
+        self.retry = retry
+        self.timeout = timeout
+        self.cache = cache
+        self._single_flight = _SingleFlight() if coalesce_requests else None
+        self.stream_json = stream_json
+        if not isinstance(json_codec, JSONCodec):
+            json_codec = get_codec(json_codec)
+        self.json_codec = json_codec
+        self.lazy_attributes = lazy_attributes
+        self.compact_records = compact_records
+        self.raw_lists = raw_lists
+        self.list_fields = list_fields
+        self.identity_map = identity_map
+        self.typed_attributes = typed_attributes
+
+        if session is not None and session_per_thread:
+            raise ValueError('A session cannot be shared when session_per_thread is set.')
+
+        self._adapter = adapter
+        self._pool_options = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block
+        }
+        self._local = threading.local() if session_per_thread else None
+        self._thread_sessions = weakref.WeakSet()
+        self._thread_sessions_lock = threading.Lock()
+        self._shared_session = None if session_per_thread else self._make_session(session)
+
+    def __getstate__(self):
+        # Locks, thread-local storage and weak references cannot be copied
+        # or pickled; they are recreated by __setstate__.
+        state = self.__dict__.copy()
+        state['_local'] = self._local is not None
+        state['_single_flight'] = self._single_flight is not None
+        del state['_thread_sessions']
+        del state['_thread_sessions_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local() if state['_local'] else None
+        self._single_flight = _SingleFlight() if state['_single_flight'] else None
+        self._thread_sessions = weakref.WeakSet()
+        self._thread_sessions_lock = threading.Lock()
+
+    @property
+    def _session(self):
+        if self._local is None:
+            return self._shared_session
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._make_session()
+            with self._thread_sessions_lock:
+                self._thread_sessions.add(session)
+        return session
+
+    def _make_session(self, session=None):
+        """
+        Create a session, or configure the one provided, with the
+        requester's transport adapter.
+
+        :param session: An existing session to configure.
+        :type session: :class:`requests.Session`
+        :rtype: :class:`requests.Session`
+        """
+        adapter = self._adapter
+        if adapter is None and session is None:
+            adapter = HTTPAdapter(**self._pool_options)
+
+        session = session or requests.Session()
+        if adapter is not None:
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        return session
 
     def request(
             self, method, endpoint=None, headers=None, use_auth=True,
-            _url=None, _kwargs=None, **kwargs):
+            _url=None, _kwargs=None, _stream=False, **kwargs):
         """
         Make a request to the Canvas API and return the response.
 
@@ -48,19 +226,25 @@ class Requester(object):
         :param _kwargs: A list of 2-tuples representing processed
             keyword arguments to be sent to Canvas as params or data.
         :type _kwargs: `list`
+        :param _stream: Whether to defer downloading the body of a `GET`
+            response until it is read, for example with
+            :func:`requests.Response.iter_content`. Streamed responses are
+            neither cached nor shared between threads.
+        :type _stream: bool
         :rtype: str
         """
         full_url = _url if _url else "%s%s" % (self.base_url, endpoint)
 
-        if not headers:
-            headers = {}
+        # Copy the headers and arguments so callers' objects are never
+        # modified, even when they are shared between threads.
+        headers = dict(headers or {})
 
         if use_auth:
             auth_header = {'Authorization': 'Bearer %s' % (self.access_token)}
             headers.update(auth_header)
 
         # Convert kwargs into list of 2-tuples and combine with _kwargs.
-        _kwargs = _kwargs or []
+        _kwargs = list(_kwargs or [])
         _kwargs.extend(kwargs.items())
 
         # Do any final argument processing before sending to request method.
@@ -71,9 +255,43 @@ class Requester(object):
             if isinstance(arg, datetime):
                 _kwargs[i] = (kw, arg.isoformat())
 
+        if _stream:
+            response = self._issue(method, full_url, headers, use_auth, _kwargs, stream=True)
+        elif method == 'GET' and self._single_flight is not None:
+            # Let concurrent identical GET requests share a single call.
+            key = (
+                ResponseCache.make_key(full_url, _kwargs, self.access_token if use_auth else None),
+                tuple(sorted(headers.items()))
+            )
+            response = self._single_flight.do(
+                key,
+                lambda: self._issue(method, full_url, headers, use_auth, _kwargs)
+            )
+        else:
+            response = self._issue(method, full_url, headers, use_auth, _kwargs)
+
+        # Decode the body with the configured JSON library.
+        if self.json_codec.name != 'json':
+            response.json = functools.partial(_decode_json, self.json_codec, response)
+
+        return response
+
+    def _issue(self, method, full_url, headers, use_auth, _kwargs, stream=False):
+        """
+        Send a fully processed request, consulting the cache and retrying
+        transient failures, and raise for error status codes.
+
+        :param method: str
+        :param full_url: str
+        :param headers: dict
+        :param use_auth: bool
+        :param _kwargs: list
+        :param stream: bool
+        :rtype: :class:`requests.Response`
+        """
         # Determine the appropriate request method.
         if method == 'GET':
-            req_method = self._get_request
+            req_method = functools.partial(self._get_request, stream=stream)
         elif method == 'POST':
             req_method = self._post_request
         elif method == 'DELETE':
@@ -81,8 +299,56 @@ class Requester(object):
         elif method == 'PUT':
             req_method = self._put_request
 
-        # Call the request method
-        response = req_method(full_url, headers, _kwargs)
+        # Serve GET requests from the cache when possible, or revalidate
+        # an expired entry with a conditional request.
+        cache_path = None if stream else self._cache_path(full_url)
+        cache_key = None
+        conditional = {}
+        if cache_path is not None and method == 'GET':
+            cache_key = self.cache.make_key(
+                full_url,
+                _kwargs,
+                self.access_token if use_auth else None
+            )
+            response = self.cache.get(cache_key)
+            if response is not None:
+                return response
+            conditional = self.cache.conditional_headers(cache_key)
+
+        # Call the request method, retrying transient failures.
+        attempt = 0
+        while True:
+            try:
+                response = self._send(
+                    req_method,
+                    full_url,
+                    dict(headers, **conditional),
+                    _kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if self.retry and self.retry.is_retryable(method, attempt, error=error):
+                    self.retry.wait(attempt, error=error)
+                    attempt += 1
+                    continue
+                raise
+
+            if self.retry and self.retry.is_retryable(method, attempt, response):
+                # Return the connection to the pool before trying again.
+                response.close()
+                self.retry.wait(attempt, response)
+                attempt += 1
+                continue
+
+            if response.status_code == 304 and conditional:
+                response.close()
+                cached = self.cache.revalidate(cache_key, response)
+                if cached is not None:
+                    return cached
+
+                # The entry was evicted meanwhile; fetch the full response.
+                conditional = {}
+                continue
+            break
 
         # Raise for status codes
         if response.status_code == 400:
@@ -93,23 +359,79 @@ class Requester(object):
             else:
                 raise Unauthorized(response.json())
         elif response.status_code == 403:
+            if is_throttled(response):
+                raise RateLimitExceeded(response.text)
             raise Forbidden(response.text)
         elif response.status_code == 404:
             raise ResourceDoesNotExist('Not Found')
-        elif response.status_code == 500:
+        elif response.status_code == 429:
+            raise RateLimitExceeded(response.text)
+        elif response.status_code >= 500:
             raise CanvasException("API encountered an error processing your request")
 
+        if cache_key is not None:
+            if response.status_code == 200:
+                self.cache.set(cache_key, cache_path, response)
+        elif cache_path is not None:
+            self.cache.invalidate(cache_path)
+
         return response
 
-    def _get_request(self, url, headers, params=None):
+    def _cache_path(self, url):
+        """
+        Return the endpoint of a URL for use with the cache, or `None` if
+        there is no cache or the URL is outside of the Canvas API.
+
+        :param url: str
+        :rtype: str
+        """
+        if self.cache is None or not url.startswith(self.base_url):
+            return None
+        return url[len(self.base_url):]
+
+    def _send(self, req_method, url, headers, data):
+        """
+        Issue a single request, pacing it with the rate limiter if one
+        is configured.
+
+        :param req_method: The method used to issue the request.
+        :type req_method: callable
+        :param url: str
+        :param headers: dict
+        :param data: list
+        :rtype: :class:`requests.Response`
+        """
+        if not self.rate_limiter:
+            return req_method(url, headers, data)
+
+        reserved = self.rate_limiter.acquire()
+        try:
+            response = req_method(url, headers, data)
+        except Exception:
+            self.rate_limiter.update(reserved)
+            raise
+        self.rate_limiter.update(reserved, response.headers)
+
+        if is_throttled(response):
+            self.rate_limiter.throttled()
+        return response
+
+    def _get_request(self, url, headers, params=None, stream=False):
         """
         Issue a GET request to the specified endpoint with the data provided.
 
         :param url: str
         :pararm headers: dict
         :param params: dict
+        :param stream: bool
         """
-        return self._session.get(url, headers=headers, params=params)
+        return self._session.get(
+            url,
+            headers=headers,
+            params=params,
+            stream=stream,
+            timeout=self.timeout
+        )
 
     def _post_request(self, url, headers, data=None):
         """
@@ -129,9 +451,15 @@ class Requester(object):
                 break
 
         # Remove file entry from data.
-        data[:] = [tup for tup in data if tup[0] != 'file']
+        data = [tup for tup in data if tup[0] != 'file']
 
-        return self._session.post(url, headers=headers, data=data, files=file)
+        return self._session.post(
+            url,
+            headers=headers,
+            data=data,
+            files=file,
+            timeout=self.timeout
+        )
 
     def _delete_request(self, url, headers, data=None):
         """
@@ -142,7 +470,7 @@ class Requester(object):
         :param params: dict
         :param data: dict
         """
-        return self._session.delete(url, headers=headers, data=data)
+        return self._session.delete(url, headers=headers, data=data, timeout=self.timeout)
 
     def _put_request(self, url, headers, data=None):
         """
@@ -153,4 +481,105 @@ class Requester(object):
         :param params: dict
         :param data: dict
         """
-        return self._session.put(url, headers=headers, data=data)
+        return self._session.put(url, headers=headers, data=data, timeout=self.timeout)
+
+    def pool_stats(self):
+        """
+        Report how many connections have been opened and how many requests
+        have been sent to each host, for adapters backed by a urllib3 pool.
+
+        Comparing the two shows how often connections are reused rather
+        than paying for a new TCP and TLS handshake.
+
+        :returns: A dictionary mapping each `scheme://host:port` to a
+            dictionary with `connections` and `requests` counts.
+        :rtype: dict
+        """
+        if self._local is None:
+            sessions = [self._shared_session]
+        else:
+            with self._thread_sessions_lock:
+                sessions = list(self._thread_sessions)
+
+        adapters = set(
+            adapter for session in sessions for adapter in session.adapters.values()
+        )
+
+        stats = {}
+        for adapter in adapters:
+            poolmanager = getattr(adapter, 'poolmanager', None)
+            if poolmanager is None:
+                continue
+
+            for key in poolmanager.pools.keys():
+                pool = poolmanager.pools[key]
+                host = '%s://%s:%s' % (pool.scheme, pool.host, pool.port)
+                entry = stats.setdefault(host, {'connections': 0, 'requests': 0})
+                entry['connections'] += pool.num_connections
+                entry['requests'] += pool.num_requests
+        return stats
+
+
+def _decode_json(codec, response, **kwargs):
+    """
+    Decode the body of a response with a JSON codec. Replaces
+    :func:`requests.Response.json` on responses returned by the requester.
+
+    :param codec: :class:`canvasapi.json_codec.JSONCodec`
+    :param response: :class:`requests.Response`
+    """
+    return codec.loads(response.content)
+
+
+class _SingleFlight(object):
+    """
+    Runs at most one call per key at a time. Callers arriving while a call
+    is in progress wait for it and share its outcome.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Call `func`, or wait for the call already in progress for `key`.
+
+        :param key: A hashable key identifying the call.
+        :param func: A callable taking no arguments.
+        :type func: callable
+        :returns: The return value of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class _Call(object):
+    """
+    The shared state of a call in progress in :class:`_SingleFlight`.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
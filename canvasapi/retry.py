@@ -0,0 +1,176 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+from email.utils import mktime_tz, parsedate_tz
+import random
+import threading
+import time
+
+from six import text_type
+
+
+class Retry(object):
+    """
+    Policy for retrying requests that failed for transient reasons.
+
+    A request is retried when the connection fails, when Canvas returns one
+    of `status_codes`, or when Canvas rejects it for exceeding the rate
+    limit. Only `methods` are retried, which by default excludes `POST`
+    since it is not idempotent. Delays grow exponentially from
+    `backoff_factor`, are capped at `max_backoff` and are randomized with
+    full jitter, unless Canvas asks for a specific delay in a
+    `Retry-After` header.
+
+    The number of retries performed is counted in :attr:`retries` and, by
+    reason, in :attr:`retries_by_reason`.
+    """
+
+    def __init__(
+            self, total=3, backoff_factor=0.5, max_backoff=60.0, jitter=True,
+            status_codes=(429, 500, 502, 503, 504), methods=('GET', 'PUT', 'DELETE'),
+            retry_throttled=True, respect_retry_after=True, sleep=time.sleep):
+        """
+        :param total: The maximum number of retries for a single request.
+        :type total: int
+        :param backoff_factor: The delay before the first retry, in seconds.
+            Each following retry waits twice as long as the previous one.
+        :type backoff_factor: float
+        :param max_backoff: The longest delay between two attempts, in seconds.
+        :type max_backoff: float
+        :param jitter: Whether to randomize delays between zero and the
+            computed backoff.
+        :type jitter: bool
+        :param status_codes: The HTTP status codes to retry.
+        :type status_codes: tuple of int
+        :param methods: The HTTP methods that are safe to retry.
+        :type methods: tuple of str
+        :param retry_throttled: Whether to retry a `403` response reporting
+            that the rate limit was exceeded.
+        :type retry_throttled: bool
+        :param respect_retry_after: Whether to honor the `Retry-After` header.
+        :type respect_retry_after: bool
+        :param sleep: A function that blocks for a number of seconds.
+        :type sleep: callable
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.retry_throttled = retry_throttled
+        self.respect_retry_after = respect_retry_after
+
+        self.retries = 0
+        self.retries_by_reason = {}
+
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks cannot be copied or pickled; __setstate__ creates a new one.
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def is_retryable(self, method, attempt, response=None, error=None):
+        """
+        Determine whether a failed attempt should be retried.
+
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param attempt: The number of retries already made for the request.
+        :type attempt: int
+        :param response: The response received, if any.
+        :type response: :class:`requests.Response`
+        :param error: The exception raised while sending the request, if any.
+        :type error: Exception
+        :rtype: bool
+        """
+        if attempt >= self.total or method.upper() not in self.methods:
+            return False
+        if error is not None:
+            return True
+        if response is None:
+            return False
+        if response.status_code in self.status_codes:
+            return True
+        return self.retry_throttled and is_throttled(response)
+
+    def backoff(self, attempt, response=None):
+        """
+        Compute the delay before the next attempt.
+
+        :param attempt: The number of retries already made for the request.
+        :type attempt: int
+        :param response: The response received, if any.
+        :type response: :class:`requests.Response`
+        :rtype: float
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def wait(self, attempt, response=None, error=None):
+        """
+        Record a retry and block until it should be attempted.
+
+        :param attempt: The number of retries already made for the request.
+        :type attempt: int
+        :param response: The response received, if any.
+        :type response: :class:`requests.Response`
+        :param error: The exception raised while sending the request, if any.
+        :type error: Exception
+        """
+        if error is not None:
+            reason = error.__class__.__name__
+        else:
+            reason = text_type(response.status_code)
+
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+        self._sleep(self.backoff(attempt, response))
+
+
+def is_throttled(response):
+    """
+    Determine whether Canvas rejected a request for exceeding the rate limit.
+
+    :param response: :class:`requests.Response`
+    :rtype: bool
+    """
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and 'Rate Limit Exceeded' in response.text
+
+
+def parse_retry_after(value):
+    """
+    Parse the value of a `Retry-After` header into a number of seconds.
+
+    :param value: Either a number of seconds or an HTTP date.
+    :type value: str
+    :rtype: float
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(mktime_tz(date) - time.time(), 0.0)
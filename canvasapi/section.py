@@ -13,6 +13,8 @@ from canvasapi.util import combine_kwargs
 @python_2_unicode_compatible
 class Section(CanvasObject):
 
+    _schema = {'students': 'canvasapi.user.User'}
+
     def __str__(self):
         return '{} - {} ({})'.format(
             self.name,
@@ -9,6 +9,16 @@ from canvasapi.upload import Uploader
 @python_2_unicode_compatible
 class Submission(CanvasObject):
 
+    _schema = {
+        'assignment': 'canvasapi.assignment.Assignment',
+        'user': 'canvasapi.user.User',
+        'submitted_at': 'date',
+        'graded_at': 'date',
+        'posted_at': 'date',
+        'cached_due_date': 'date'
+    }
+    _schema_complete = True
+
     def __str__(self):
         return "{}".format(self.id)
 
@@ -15,6 +15,12 @@ from canvasapi.util import combine_kwargs, obj_or_id
 @python_2_unicode_compatible
 class User(CanvasObject):
 
+    _schema = {
+        'created_at': 'date',
+        'last_login': 'date'
+    }
+    _schema_complete = True
+
     def __str__(self):
         return "{} ({})".format(self.name, self.id)
 
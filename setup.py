@@ -23,7 +23,8 @@ setup(
     license='MIT License',
     packages=['canvasapi'],
     include_package_data=True,
-    install_requires=['pytz', 'requests', 'six'],
+    install_requires=['futures; python_version < "3"', 'pytz', 'requests', 'six'],
+    extras_require={'export': ['numpy', 'pyarrow']},
     zip_safe=False,
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -0,0 +1,32 @@
+"""
+Coroutines for the tests in test_async_canvas, kept in their own module
+because their syntax requires Python 3.5 or newer.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import asyncio
+
+from canvasapi.async_canvas import AsyncCanvas
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def get_courses(canvas, course_id, count):
+    return await asyncio.gather(*[canvas.get_course(course_id) for _ in range(count)])
+
+
+async def get_users(canvas, course_id):
+    course = await canvas.get_course(course_id)
+    users = await course.get_users()
+    return users, await users.to_list()
+
+
+async def get_course_with_context(base_url, access_token, course_id):
+    async with AsyncCanvas(base_url, access_token, max_workers=2) as canvas:
+        course = await canvas.get_course(course_id)
+    return canvas, course
@@ -0,0 +1,97 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+import unittest
+
+import requests_mock
+
+from canvasapi.course import Course
+from canvasapi.exceptions import ResourceDoesNotExist
+from canvasapi.user import User
+from tests import settings
+from tests.util import register_uris
+
+if sys.version_info >= (3, 5, 2):
+    from canvasapi.async_canvas import AsyncCanvas, AsyncPaginatedList, AsyncProxy
+    from tests.async_util import get_course_with_context, get_courses, get_users, run
+
+
+@unittest.skipIf(sys.version_info < (3, 5, 2), 'AsyncCanvas requires Python 3.5.2 or newer')
+@requests_mock.Mocker()
+class TestAsyncCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = AsyncCanvas(settings.BASE_URL, settings.API_KEY, max_workers=4)
+
+    def tearDown(self):
+        self.canvas.close()
+
+    def test_get_course(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+
+        course = run(self.canvas.get_course(1))
+
+        self.assertIsInstance(course, AsyncProxy)
+        self.assertIsInstance(course.unwrap(), Course)
+        self.assertEqual(course.name, 'Test Course 1234')
+
+    def test_get_courses_concurrently(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+
+        courses = run(get_courses(self.canvas, 1, 10))
+
+        self.assertEqual(len(courses), 10)
+        self.assertTrue(all(course.id == 1 for course in courses))
+
+    def test_paginated_list(self, m):
+        register_uris({'course': ['get_by_id', 'get_users', 'get_users_p2']}, m)
+
+        paginated_list, users = run(get_users(self.canvas, 1))
+
+        self.assertIsInstance(paginated_list, AsyncPaginatedList)
+        self.assertEqual(len(users), 4)
+        self.assertIsInstance(users[0].unwrap(), User)
+        self.assertEqual([user.id for user in users], [1, 2, 3, 4])
+
+    def test_paginated_list_chunks(self, m):
+        register_uris({'course': ['get_by_id', 'get_users', 'get_users_p2']}, m)
+        paginated_list, _ = run(get_users(self.canvas, 1))
+
+        chunked = AsyncPaginatedList(paginated_list.unwrap(), self.canvas._executor, chunk_size=3)
+        users = run(chunked.to_list())
+
+        self.assertEqual([user.id for user in users], [1, 2, 3, 4])
+        self.assertIs(chunked.unwrap(), paginated_list.unwrap())
+
+    def test_context_manager(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+
+        canvas, course = run(get_course_with_context(settings.BASE_URL, settings.API_KEY, 1))
+
+        self.assertEqual(course.name, 'Test Course 1234')
+        with self.assertRaises(RuntimeError):
+            canvas._executor.submit(len, [])
+
+    def test_repr(self, m):
+        register_uris({'course': ['get_by_id', 'get_users']}, m)
+        course = run(self.canvas.get_course(1))
+        users = run(course.get_users())
+
+        self.assertEqual(repr(self.canvas), '<AsyncCanvas>')
+        self.assertEqual(repr(course), '<AsyncProxy of %r>' % (course.unwrap(),))
+        self.assertEqual(str(course), str(course.unwrap()))
+        self.assertEqual(repr(users), '<AsyncPaginatedList of type User>')
+
+    def test_pool_maxsize(self, m):
+        requester = self.canvas._canvas._Canvas__requester
+        self.assertEqual(requester._session.adapters['https://']._pool_maxsize, 4)
+
+        canvas = AsyncCanvas(settings.BASE_URL, settings.API_KEY, pool_maxsize=8)
+        requester = canvas._canvas._Canvas__requester
+        self.assertEqual(requester._session.adapters['https://']._pool_maxsize, 8)
+        canvas.close()
+
+    def test_exception_propagates(self, m):
+        register_uris({'generic': ['not_found']}, m)
+
+        with self.assertRaises(ResourceDoesNotExist):
+            run(self.canvas.get_course(1))
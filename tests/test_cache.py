@@ -0,0 +1,401 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import requests
+import requests_mock
+
+from canvasapi import Canvas
+from canvasapi.cache import MemoryCache, ResponseCache, SqliteCache
+from canvasapi.course import Course
+from canvasapi.exceptions import ResourceDoesNotExist
+from tests import settings
+from tests.util import register_uris
+
+
+def make_response(content=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = settings.BASE_URL + 'courses/1'
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+class CacheTests(object):
+    """Tests shared by every cache backend."""
+
+    def make_cache(self, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = self.make_cache(ttl=60, clock=lambda: self.now)
+
+    # get() / set()
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('missing'))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_set_get(self):
+        self.cache.set('key', 'courses/1', make_response(b'{"id": 1}', {'ETag': '"abc"'}))
+
+        response = self.cache.get('key')
+        self.assertEqual(response.json(), {'id': 1})
+        self.assertEqual(response.headers['etag'], '"abc"')
+        self.assertTrue(response.from_cache)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_expiry(self):
+        self.cache.set('key', 'courses/1', make_response())
+
+        self.now = 59.0
+        self.assertIsNotNone(self.cache.get('key'))
+        self.now = 60.0
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_ttls(self):
+        cache = self.make_cache(
+            ttl=60,
+            ttls={r'^courses/\d+$': 3600, r'^users/': 0},
+            clock=lambda: self.now
+        )
+        cache.set('course', 'courses/1', make_response())
+        cache.set('user', 'users/1', make_response())
+
+        self.now = 600.0
+        self.assertIsNotNone(cache.get('course'))
+        self.assertIsNone(cache.get('user'))
+
+    def test_lru_eviction(self):
+        cache = self.make_cache(maxsize=2, clock=lambda: self.now)
+        cache.set('a', 'courses/1', make_response())
+        self.now += 1
+        cache.set('b', 'courses/2', make_response())
+        self.now += 1
+        cache.get('a')
+        self.now += 1
+        cache.set('c', 'courses/3', make_response())
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    # conditional_headers()
+    def test_conditional_headers(self):
+        self.cache.set('key', 'courses/1', make_response(headers={
+            'ETag': '"abc"',
+            'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'
+        }))
+        self.cache.set('plain', 'courses/2', make_response())
+
+        self.assertEqual(self.cache.conditional_headers('key'), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+        })
+        self.assertEqual(self.cache.conditional_headers('plain'), {})
+        self.assertEqual(self.cache.conditional_headers('missing'), {})
+
+    # revalidate()
+    def test_revalidate(self):
+        self.cache.set('key', 'courses/1', make_response(b'{"id": 1}', {'ETag': '"abc"'}))
+        self.now = 120.0
+        self.assertIsNone(self.cache.get('key'))
+
+        not_modified = make_response(b'', {'ETag': '"def"', 'Content-Length': '0'})
+        not_modified.status_code = 304
+        response = self.cache.revalidate('key', not_modified)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'id': 1})
+        self.assertEqual(response.headers['ETag'], '"def"')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertIsNotNone(self.cache.get('key'))
+        self.assertEqual(self.cache.revalidations, 1)
+
+    def test_revalidate_missing(self):
+        self.assertIsNone(self.cache.revalidate('missing', make_response()))
+
+    # invalidate()
+    def test_invalidate(self):
+        self.cache.set('courses', 'courses', make_response())
+        self.cache.set('course_1', 'courses/1', make_response())
+        self.cache.set('course_1_users', 'courses/1/users', make_response())
+        self.cache.set('course_2', 'courses/2', make_response())
+        self.cache.set('course_10', 'courses/10', make_response())
+
+        self.cache.invalidate('courses/1')
+
+        self.assertIsNone(self.cache.get('courses'))
+        self.assertIsNone(self.cache.get('course_1'))
+        self.assertIsNone(self.cache.get('course_1_users'))
+        self.assertIsNotNone(self.cache.get('course_2'))
+        self.assertIsNotNone(self.cache.get('course_10'))
+
+    def test_clear(self):
+        self.cache.set('key', 'courses/1', make_response())
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+
+    # copying
+    def test_copy(self):
+        cache = self.make_cache(ttl=60)
+        cache.set('key', 'courses/1', make_response(b'{"id": 1}'))
+        cache.get('key')
+
+        for copied in (pickle.loads(pickle.dumps(cache)), copy.deepcopy(cache)):
+            self.assertIsNot(copied._lock, cache._lock)
+            self.assertEqual(copied.get('key').json(), {'id': 1})
+            self.assertEqual(len(copied), 1)
+
+
+class TestMemoryCache(CacheTests, unittest.TestCase):
+
+    def make_cache(self, **kwargs):
+        return MemoryCache(**kwargs)
+
+
+class TestSqliteCache(CacheTests, unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        super(TestSqliteCache, self).setUp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_cache(self, **kwargs):
+        return SqliteCache(os.path.join(self.directory, 'cache.sqlite'), **kwargs)
+
+    def test_persistence(self):
+        self.cache.set('key', 'courses/1', make_response(b'{"id": 1}'))
+        self.cache.close()
+
+        cache = self.make_cache(clock=lambda: self.now)
+        self.assertEqual(cache.get('key').json(), {'id': 1})
+        cache.close()
+
+    def test_reads_not_written(self):
+        self.cache.set('key', 'courses/1', make_response())
+        changes = self.cache._connection.total_changes
+
+        self.now = 10.0
+        self.assertIsNotNone(self.cache.get('key'))
+        self.assertEqual(self.cache.conditional_headers('key'), {})
+        self.assertEqual(self.cache._connection.total_changes, changes)
+
+        self.cache.close()
+        cache = self.make_cache(clock=lambda: self.now)
+        self.assertEqual(
+            cache._connection.execute('SELECT used_at FROM canvasapi_responses').fetchone()[0],
+            10.0
+        )
+        cache.close()
+
+    def test_pending_reads_saved(self):
+        self.cache.MAX_PENDING_READS = 3
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, 'courses/1', make_response())
+
+        self.now = 10.0
+        changes = self.cache._connection.total_changes
+        self.cache.get('a')
+        self.cache.get('b')
+        self.assertEqual(self.cache._connection.total_changes, changes)
+
+        self.cache.get('c')
+        self.assertEqual(self.cache._used, {})
+        self.assertEqual(self.cache._connection.total_changes, changes + 3)
+
+        rows = self.cache._connection.execute('SELECT used_at FROM canvasapi_responses')
+        self.assertEqual([row[0] for row in rows], [10.0] * 3)
+
+    def test_shared_database(self):
+        self.cache.close()
+        path = os.path.join(self.directory, 'cache.sqlite')
+        connection = sqlite3.connect(path)
+        connection.execute('CREATE TABLE responses (id INTEGER, answer TEXT)')
+        connection.execute("INSERT INTO responses VALUES (1, 'kept')")
+        connection.commit()
+        connection.close()
+
+        cache = self.make_cache()
+        cache.set('key', 'courses/1', make_response())
+        cache.clear()
+        cache.close()
+
+        connection = sqlite3.connect(path)
+        self.assertEqual(connection.execute('SELECT * FROM responses').fetchall(), [(1, 'kept')])
+        connection.close()
+
+    def test_schema_mismatch(self):
+        self.cache.close()
+        path = os.path.join(self.directory, 'other.sqlite')
+        connection = sqlite3.connect(path)
+        connection.execute('CREATE TABLE canvasapi_responses (key TEXT, path TEXT)')
+        connection.commit()
+        connection.close()
+
+        with self.assertRaises(ValueError):
+            SqliteCache(path)
+
+        connection = sqlite3.connect(path)
+        columns = [row[1] for row in connection.execute('PRAGMA table_info(canvasapi_responses)')]
+        self.assertEqual(columns, ['key', 'path'])
+        connection.close()
+
+    def test_count(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, 'courses/%s' % (key), make_response())
+        self.cache.set('a', 'courses/a', make_response())
+        self.assertEqual(len(self.cache), 3)
+
+        self.cache.invalidate('courses/b')
+        self.assertEqual(len(self.cache), 2)
+        self.cache.close()
+
+        cache = self.make_cache()
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    @unittest.skipIf(
+        not hasattr(sqlite3.Connection, 'set_trace_callback'),
+        'sqlite3 cannot trace statements'
+    )
+    def test_eviction_only_when_full(self):
+        cache = self.make_cache(maxsize=3, clock=lambda: self.now)
+        statements = []
+        cache._connection.set_trace_callback(statements.append)
+
+        for key in ('a', 'b', 'c', 'a'):
+            self.now += 1
+            cache.set(key, 'courses/1', make_response())
+        self.assertFalse([sql for sql in statements if sql.startswith('DELETE')])
+
+        self.now += 1
+        cache.set('d', 'courses/1', make_response())
+        self.assertEqual(len([sql for sql in statements if sql.startswith('DELETE')]), 1)
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get('b'))
+        cache.close()
+
+    def test_invalidate_root(self):
+        self.cache.set('key', 'courses/1', make_response())
+        self.cache.invalidate('')
+        self.assertEqual(len(self.cache), 0)
+
+    @unittest.skipIf(
+        not hasattr(sqlite3.Connection, 'set_trace_callback'),
+        'sqlite3 cannot trace statements'
+    )
+    def test_invalidate_single_statement(self):
+        for course_id in range(50):
+            self.cache.set(str(course_id), 'courses/%s/users' % (course_id), make_response())
+
+        statements = []
+        self.cache._connection.set_trace_callback(statements.append)
+        self.cache.invalidate('courses/7?include[]=users')
+        self.assertEqual(len([sql for sql in statements if sql.startswith('DELETE')]), 1)
+        self.assertEqual(len(self.cache), 49)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    # make_key()
+    def test_make_key_normalizes_params(self):
+        url = settings.BASE_URL + 'courses'
+        key = ResponseCache.make_key(url, [('b', 2), ('a', '1')], 'token')
+
+        self.assertEqual(key, ResponseCache.make_key(url, [('a', 1), ('b', '2')], 'token'))
+        self.assertNotEqual(key, ResponseCache.make_key(url, [('a', 1)], 'token'))
+        self.assertNotEqual(key, ResponseCache.make_key(url, [('a', 1), ('b', 2)], 'other'))
+
+
+@requests_mock.Mocker()
+class TestRequesterCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.canvas = Canvas(settings.BASE_URL, settings.API_KEY, cache=self.cache)
+
+    def test_get_cached(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+
+        first = self.canvas.get_course(1)
+        second = self.canvas.get_course(1)
+
+        self.assertIsInstance(second, Course)
+        self.assertEqual(first.name, second.name)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_params_in_key(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+
+        self.canvas.get_course(1)
+        self.canvas.get_course(1, include=['term'])
+
+        self.assertEqual(m.call_count, 2)
+
+    def test_invalidated_by_update(self, m):
+        register_uris({'course': ['get_by_id', 'update']}, m)
+
+        course = self.canvas.get_course(1)
+        course.update(course={'name': 'New Name'})
+        self.canvas.get_course(1)
+
+        self.assertEqual(m.call_count, 3)
+
+    def test_errors_not_cached(self, m):
+        register_uris({'generic': ['not_found']}, m)
+
+        for _ in range(2):
+            with self.assertRaises(ResourceDoesNotExist):
+                self.canvas.get_course(1)
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_conditional_get(self, m):
+        now = [0.0]
+        cache = MemoryCache(ttl=60, clock=lambda: now[0])
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, cache=cache)
+        m.register_uri('GET', settings.BASE_URL + 'courses/1', [
+            {'json': {'id': 1, 'name': 'Course'}, 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304, 'headers': {'ETag': '"v1"'}},
+        ])
+
+        canvas.get_course(1)
+        now[0] = 120.0
+        course = canvas.get_course(1)
+
+        self.assertEqual(course.name, 'Course')
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(m.last_request.headers['If-None-Match'], '"v1"')
+        self.assertEqual(cache.revalidations, 1)
+
+        canvas.get_course(1)
+        self.assertEqual(m.call_count, 2)
+
+    def test_conditional_get_evicted(self, m):
+        cache = MemoryCache(ttl=60)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, cache=cache)
+        m.register_uri('GET', settings.BASE_URL + 'courses/1', [
+            {'status_code': 304},
+            {'json': {'id': 1, 'name': 'Course'}},
+        ])
+        cache.conditional_headers = lambda key: {'If-None-Match': '"v1"'}
+
+        course = canvas.get_course(1)
+
+        self.assertEqual(course.name, 'Course')
+        self.assertEqual(m.call_count, 2)
+        self.assertNotIn('If-None-Match', m.last_request.headers)
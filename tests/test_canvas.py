@@ -1,4 +1,5 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+import functools
 import unittest
 from datetime import datetime
 
@@ -504,3 +505,42 @@ class TestCanvas(unittest.TestCase):
         courses = self.canvas.search_all_courses()
         self.assertIsInstance(courses, list)
         self.assertEqual(len(courses), 2)
+
+    # gather()
+    def test_gather(self, m):
+        register_uris({'generic': ['not_found']}, m)
+        register_uris({'course': ['get_by_id', 'get_by_id_2']}, m)
+
+        results = self.canvas.gather([
+            functools.partial(self.canvas.get_course, 1),
+            functools.partial(self.canvas.get_course, settings.INVALID_ID),
+            functools.partial(self.canvas.get_course, 2),
+        ], concurrency=3)
+
+        self.assertEqual(len(results), 3)
+        self.assertIsInstance(results[0], Course)
+        self.assertEqual(results[0].id, 1)
+        self.assertIsInstance(results[1], ResourceDoesNotExist)
+        self.assertIsInstance(results[2], Course)
+        self.assertEqual(results[2].id, 2)
+
+    def test_gather_raise(self, m):
+        register_uris({'generic': ['not_found']}, m)
+        register_uris({'course': ['get_by_id']}, m)
+
+        with self.assertRaises(ResourceDoesNotExist):
+            self.canvas.gather([
+                functools.partial(self.canvas.get_course, 1),
+                functools.partial(self.canvas.get_course, settings.INVALID_ID),
+            ], return_exceptions=False)
+
+    def test_gather_empty(self, m):
+        self.assertEqual(self.canvas.gather([]), [])
+
+    # map()
+    def test_map(self, m):
+        register_uris({'course': ['get_by_id', 'get_by_id_2']}, m)
+
+        courses = self.canvas.map(self.canvas.get_course, [2, 1, 2], concurrency=2)
+
+        self.assertEqual([course.id for course in courses], [2, 1, 2])
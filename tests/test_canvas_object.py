@@ -1,11 +1,24 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
+from datetime import datetime
+import json
+import pickle
 import unittest
 
-from canvasapi.canvas_object import CanvasObject
+import pytz
+
+from canvasapi.canvas_object import CanvasObject, CompactRecord, compact_class, parse_date
+from canvasapi.enrollment import Enrollment
+from canvasapi.requester import Requester
+from canvasapi.user import User
+from tests import settings
 
 
 class TestCanvasObject(unittest.TestCase):
 
+    def setUp(self):
+        self.lazy_requester = Requester(settings.BASE_URL, settings.API_KEY, lazy_attributes=True)
+
     # to_json()
     def test_canvas_object_to_json(self):
         attributes = {'name': 'Test Object', 'id': 1}
@@ -18,3 +31,229 @@ class TestCanvasObject(unittest.TestCase):
         canvas_obj.set_attributes(attributes)
 
         self.assertNotEqual(canvas_obj.to_json(), prev_json)
+
+    # set_attributes()
+    def test_set_attributes_date(self):
+        canvas_obj = CanvasObject(None, {'start_at': '2012-05-05T00:00:00Z', 'end_at': None})
+
+        self.assertEqual(canvas_obj.start_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertFalse(hasattr(canvas_obj, 'end_at_date'))
+
+    def test_set_attributes_date_variants(self):
+        canvas_obj = CanvasObject(None, {
+            'fraction_at': '2012-05-05T00:00:00.25Z',
+            'offset_at': '2012-05-04T18:30:00-06:00',
+            'invalid_at': '2012-13-05T00:00:00Z',
+            'suffixed_at': '2012-05-05T00:00:00Zulu',
+            'newline_at': '2012-05-05T00:00:00Z\n'
+        })
+
+        self.assertEqual(
+            canvas_obj.fraction_at_date,
+            datetime(2012, 5, 5, 0, 0, 0, 250000, tzinfo=pytz.utc)
+        )
+        self.assertEqual(canvas_obj.offset_at_date, datetime(2012, 5, 5, 0, 30, tzinfo=pytz.utc))
+        self.assertFalse(hasattr(canvas_obj, 'invalid_at_date'))
+        self.assertFalse(hasattr(canvas_obj, 'suffixed_at_date'))
+        self.assertFalse(hasattr(canvas_obj, 'newline_at_date'))
+
+    def test_set_attributes_lazy(self):
+        canvas_obj = CanvasObject(self.lazy_requester, {
+            'id': 1,
+            'start_at': '2012-05-05T00:00:00Z',
+            'end_at': None
+        })
+        self.assertNotIn('id', canvas_obj.__dict__)
+        self.assertNotIn('start_at_date', canvas_obj.__dict__)
+
+        self.assertEqual(canvas_obj.id, 1)
+        self.assertEqual(canvas_obj.start_at, '2012-05-05T00:00:00Z')
+        self.assertEqual(canvas_obj.start_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertIn('start_at_date', canvas_obj.__dict__)
+        self.assertIsNone(canvas_obj.end_at)
+        self.assertFalse(hasattr(canvas_obj, 'end_at_date'))
+        self.assertFalse(hasattr(canvas_obj, 'missing'))
+
+    def test_set_attributes_lazy_update(self):
+        canvas_obj = CanvasObject(self.lazy_requester, {
+            'name': 'Test Object',
+            'start_at': '2012-05-05T00:00:00Z'
+        })
+        self.assertEqual(canvas_obj.name, 'Test Object')
+        self.assertEqual(canvas_obj.start_at_date.year, 2012)
+
+        canvas_obj.set_attributes({'start_at': '2013-05-05T00:00:00Z'})
+        self.assertEqual(canvas_obj.name, 'Test Object')
+        self.assertEqual(canvas_obj.start_at_date.year, 2013)
+        self.assertEqual(json.loads(canvas_obj.to_json()), {'start_at': '2013-05-05T00:00:00Z'})
+
+    def test_missing_attribute_message(self):
+        canvas_obj = CanvasObject(None, {'id': 1})
+
+        with self.assertRaises(AttributeError) as context:
+            canvas_obj.missing
+        self.assertEqual(
+            str(context.exception),
+            "'CanvasObject' object has no attribute 'missing'"
+        )
+
+    # parse_date()
+    def test_parse_date(self):
+        self.assertEqual(parse_date('2012-05-05T00:00:00Z'), datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertEqual(
+            parse_date('2012-05-05T02:00:00.1234567+0200'),
+            datetime(2012, 5, 5, 0, 0, 0, 123456, tzinfo=pytz.utc)
+        )
+        self.assertEqual(parse_date('2012-05-05T00:00:00+00:00').tzinfo, pytz.utc)
+
+    def test_parse_date_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_date('2012-05-05')
+        with self.assertRaises(ValueError):
+            parse_date('2012-05-05T00:00:00Z\n')
+
+
+class TestTypedAttributes(unittest.TestCase):
+
+    class Typed(CanvasObject):
+        _schema = {
+            'user': 'canvasapi.user.User',
+            'enrollments': Enrollment,
+            'points': float
+        }
+
+    class Dated(CanvasObject):
+        _schema = {'start_at': 'date'}
+        _schema_complete = True
+
+    def setUp(self):
+        self.requester = Requester(settings.BASE_URL, settings.API_KEY, typed_attributes=True)
+        self.attributes = {
+            'user': {'id': 1, 'created_at': '2012-05-05T00:00:00Z'},
+            'enrollments': [{'id': 2, 'type': 'StudentEnrollment'}, None],
+            'points': '1.5',
+            'untyped': {'id': 3}
+        }
+
+    def check_typed(self, typed):
+        self.assertIsInstance(typed.user, User)
+        self.assertIs(typed.user._requester, self.requester)
+        self.assertEqual(typed.user.created_at_date.year, 2012)
+        self.assertIsInstance(typed.enrollments[0], Enrollment)
+        self.assertIsNone(typed.enrollments[1])
+        self.assertEqual(typed.points, 1.5)
+        self.assertEqual(typed.untyped, {'id': 3})
+        self.assertEqual(typed.attributes['user'], {'id': 1, 'created_at': '2012-05-05T00:00:00Z'})
+
+    def test_typed_attributes(self):
+        self.check_typed(self.Typed(self.requester, self.attributes))
+
+    def test_typed_attributes_lazy(self):
+        self.requester.lazy_attributes = True
+        self.check_typed(self.Typed(self.requester, self.attributes))
+
+    def test_typed_attributes_compact(self):
+        typed = compact_class(self.Typed)(self.requester, self.attributes)
+        self.check_typed(typed)
+        self.assertIs(typed.user, typed.user)
+
+    def check_dated(self, dated):
+        self.assertEqual(dated.start_at, '2012-05-05T00:00:00Z')
+        self.assertEqual(dated.start_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertEqual(dated.end_at, '2012-08-05T00:00:00Z')
+        self.assertFalse(hasattr(dated, 'end_at_date'))
+
+    def test_schema_date(self):
+        attributes = {'start_at': '2012-05-05T00:00:00Z', 'end_at': '2012-08-05T00:00:00Z'}
+        self.check_dated(self.Dated(self.requester, attributes))
+        self.check_dated(compact_class(self.Dated)(self.requester, attributes))
+
+        self.requester.lazy_attributes = True
+        self.check_dated(self.Dated(self.requester, attributes))
+
+    def test_typed_attributes_disabled(self):
+        self.requester.typed_attributes = False
+        typed = self.Typed(self.requester, self.attributes)
+        self.assertEqual(typed.user, {'id': 1, 'created_at': '2012-05-05T00:00:00Z'})
+        self.assertEqual(typed.points, '1.5')
+
+    def test_complete_schema(self):
+        enrollment = Enrollment(self.requester, {
+            'id': 1,
+            'created_at': '2012-05-05T00:00:00Z',
+            'sis_import_id': '2012-05-05T00:00:00Z'
+        })
+        self.assertEqual(enrollment.created_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertFalse(hasattr(enrollment, 'sis_import_id_date'))
+
+    def test_enrollment_user(self):
+        enrollment = Enrollment(self.requester, {'id': 1, 'user': {'id': 2, 'name': 'John Doe'}})
+        self.assertIsInstance(enrollment.user, User)
+        self.assertEqual(enrollment.user.name, 'John Doe')
+
+
+class TestCompactRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.compact_class = compact_class(Enrollment)
+
+    # compact_class()
+    def test_compact_class(self):
+        self.assertIs(compact_class(Enrollment), self.compact_class)
+        self.assertTrue(issubclass(self.compact_class, Enrollment))
+        self.assertTrue(issubclass(self.compact_class, CompactRecord))
+        self.assertEqual(self.compact_class.__name__, 'Enrollment')
+
+    def test_attribute_access(self):
+        record = self.compact_class(None, {
+            'id': 1,
+            'type': 'StudentEnrollment',
+            'created_at': '2012-05-05T00:00:00Z'
+        })
+
+        self.assertEqual(record.id, 1)
+        self.assertEqual(record.created_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertFalse(hasattr(record, 'type_date'))
+        self.assertFalse(hasattr(record, 'missing'))
+        self.assertEqual(str(record), 'StudentEnrollment (1)')
+        self.assertEqual(json.loads(record.to_json())['type'], 'StudentEnrollment')
+        self.assertIn('type=StudentEnrollment', repr(record))
+
+    def test_pickle(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY)
+        record = self.compact_class(requester, {
+            'id': 1,
+            'type': 'StudentEnrollment',
+            'created_at': '2012-05-05T00:00:00Z'
+        })
+
+        for copied in (pickle.loads(pickle.dumps(record)), copy.deepcopy(record)):
+            self.assertIs(type(copied), self.compact_class)
+            self.assertEqual(copied.attributes, record.attributes)
+            self.assertEqual(copied.created_at_date, record.created_at_date)
+            self.assertEqual(copied._requester.base_url, settings.BASE_URL)
+
+    def test_uninitialized(self):
+        record = self.compact_class.__new__(self.compact_class)
+
+        with self.assertRaises(AttributeError):
+            record.id
+
+    def test_shared_key_table(self):
+        key_tables = {}
+        first = self.compact_class(None, {'id': 1, 'type': 'StudentEnrollment'}, key_tables)
+        second = self.compact_class(None, {'id': 2, 'type': 'TeacherEnrollment'}, key_tables)
+
+        self.assertIs(first._keys, second._keys)
+        self.assertEqual(len(key_tables), 1)
+        self.assertEqual(second.type, 'TeacherEnrollment')
+
+    def test_set_attributes(self):
+        record = self.compact_class(None, {'id': 1, 'type': 'StudentEnrollment'})
+        record.set_attributes({'type': 'TeacherEnrollment', 'user_id': 2})
+
+        self.assertEqual(record.attributes, {'id': 1, 'type': 'TeacherEnrollment', 'user_id': 2})
+        self.assertEqual(record.type, 'TeacherEnrollment')
+
+        super(Enrollment, record).set_attributes({'user_id': 3})
+        self.assertEqual(record.user_id, 3)
@@ -0,0 +1,280 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+from datetime import datetime
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import requests_mock
+
+from canvasapi import Canvas, export
+from canvasapi.paginated_list import PaginatedList
+from canvasapi.user import User
+from tests import settings
+from tests.util import register_uris
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+ROWS = [
+    {'id': 1, 'created_at': '2012-05-05T00:00:00Z', 'score': 90, 'late': True, 'user': {'id': 3}},
+    {'id': 2, 'created_at': None, 'score': 90.5, 'late': None, 'user': None, 'name': 'B'},
+]
+
+
+class TestInferColumns(unittest.TestCase):
+
+    def test_infer_columns(self):
+        self.assertEqual(export.infer_columns(None, ROWS), [
+            ('id', 'int'),
+            ('created_at', 'date'),
+            ('score', 'float'),
+            ('late', 'bool'),
+            ('user', 'json'),
+            ('name', 'string'),
+        ])
+
+    def test_infer_columns_fields(self):
+        self.assertEqual(
+            export.infer_columns(['missing', ('id', 'string')], ROWS),
+            [('missing', 'string'), ('id', 'string')]
+        )
+
+    def test_infer_columns_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            export.infer_columns([('id', 'decimal')], ROWS)
+
+    def test_write_ndjson(self):
+        output = io.StringIO()
+        self.assertEqual(export.write_ndjson(ROWS, output, fields=['id', 'user']), 2)
+        self.assertEqual(
+            [json.loads(line) for line in output.getvalue().splitlines()],
+            [{'id': 1, 'user': {'id': 3}}, {'id': 2, 'user': None}]
+        )
+
+    def test_missing_dependency(self):
+        saved = sys.modules.get('numpy')
+        sys.modules['numpy'] = None
+        try:
+            with self.assertRaises(ImportError):
+                export.to_records(ROWS)
+        finally:
+            if saved is None:
+                del sys.modules['numpy']
+            else:
+                sys.modules['numpy'] = saved
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestToRecords(unittest.TestCase):
+
+    def test_to_records(self):
+        records = export.to_records(ROWS, batch_size=10)
+
+        self.assertEqual(records.dtype['id'], numpy.dtype('i8'))
+        self.assertEqual(records[0].created_at, numpy.datetime64('2012-05-05T00:00:00', 'us'))
+        self.assertTrue(numpy.isnat(records[1].created_at))
+        self.assertEqual(list(records.score), [90.0, 90.5])
+        self.assertEqual(list(records.late), [True, None])
+        self.assertEqual(list(records.name), ['', 'B'])
+        self.assertEqual(records.dtype['name'], numpy.dtype(object))
+        self.assertEqual(records[0].user.replace(' ', ''), '{"id":3}')
+
+    def test_to_records_later_batches(self):
+        rows = [
+            {'id': 1, 'score': 10, 'created_at': '2012-05-05T00:00:00Z', 'note': None},
+            {'id': 2, 'score': 9.5, 'created_at': 'unknown', 'note': {'text': 'late'}},
+        ]
+        records = export.to_records(rows, batch_size=1)
+        self.assertEqual(records.dtype['id'], numpy.dtype('i8'))
+        self.assertEqual(list(records.score), [10.0, 9.5])
+        self.assertTrue(numpy.isnat(records[1].created_at))
+        self.assertEqual(json.loads(records[1].note), {'text': 'late'})
+
+    def test_to_records_long_string(self):
+        rows = [{'body': 'x' * 100000}] + [{'body': 'short'}] * 99
+        records = export.to_records(rows, batch_size=10)
+
+        self.assertEqual(records.dtype['body'], numpy.dtype(object))
+        self.assertEqual(len(records[0].body), 100000)
+        self.assertEqual(records[1].body, 'short')
+        self.assertLess(records.nbytes, 100000)
+
+    def test_to_records_int_column(self):
+        rows = [{'id': 1, 'course_id': 4, 'points': 3}, {'id': 2, 'course_id': 5, 'points': 2}]
+        records = export.to_records(rows, batch_size=1)
+        self.assertEqual(records.dtype['course_id'], numpy.dtype('i8'))
+        self.assertEqual(records.dtype['points'], numpy.dtype('f8'))
+
+        records = export.to_records(rows, ['id', ('points', 'int')], batch_size=1)
+        self.assertEqual(list(records.points), [3, 2])
+        self.assertEqual(records.dtype['points'], numpy.dtype('i8'))
+
+        rows[1]['points'] = 2.5
+        with self.assertRaises(ValueError) as context:
+            export.to_records(rows, ['id', ('points', 'int')], batch_size=1)
+        self.assertIn("'points'", str(context.exception))
+
+    def test_to_records_empty(self):
+        records = export.to_records([], ['id'])
+        self.assertEqual(len(records), 0)
+        self.assertEqual(records.dtype.names, ('id',))
+
+        records = export.to_records([])
+        self.assertEqual(len(records), 0)
+        self.assertEqual(records.dtype.names, ())
+
+    def test_to_records_missing_values(self):
+        rows = [
+            {'score': 1.5, 'created_at': '2012-13-05T00:00:00Z'},
+            {'score': None, 'created_at': '2012-05-05T00:00:00Z'},
+        ]
+        records = export.to_records(rows)
+
+        self.assertTrue(numpy.isnan(records[1].score))
+        self.assertTrue(numpy.isnat(records[0].created_at))
+        self.assertEqual(records[1].created_at, numpy.datetime64('2012-05-05T00:00:00', 'us'))
+
+
+@unittest.skipIf(pyarrow is None, 'PyArrow is not installed')
+class TestToArrow(unittest.TestCase):
+
+    def test_to_arrow(self):
+        fields = ['id', 'score', 'created_at']
+        table = export.to_arrow(ROWS, batch_size=1, fields=fields)
+
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.schema.field('id').type, pyarrow.int64())
+        self.assertEqual(table.schema.field('created_at').type, pyarrow.timestamp('us', tz='UTC'))
+        self.assertEqual(table.column('score').to_pylist(), [90.0, 90.5])
+        self.assertEqual(
+            table.column('created_at').to_pylist()[0].replace(tzinfo=None),
+            datetime(2012, 5, 5)
+        )
+
+    def test_to_arrow_empty(self):
+        table = export.to_arrow([], [('id', 'int')])
+
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.schema.field('id').type, pyarrow.int64())
+
+    def test_to_parquet(self):
+        output = io.BytesIO()
+        export.to_parquet(ROWS, output, batch_size=1, fields=['id', 'created_at'])
+
+        output.seek(0)
+        table = pyarrow.parquet.read_table(output)
+        self.assertEqual(table.column('id').to_pylist(), [1, 2])
+        self.assertIsNone(table.column('created_at').to_pylist()[1])
+
+    def test_to_parquet_error(self):
+        def rows():
+            yield ROWS[0]
+            yield ROWS[1]
+            raise IOError('Connection lost')
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'rows.parquet')
+        with self.assertRaises(IOError):
+            export.to_parquet(rows(), path, ['id', 'created_at'], batch_size=1)
+        self.assertFalse(os.path.exists(path))
+
+
+@requests_mock.Mocker()
+class TestPaginatedListExport(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = Canvas(settings.BASE_URL, settings.API_KEY)
+        self.requester = self.canvas._Canvas__requester
+
+    def make_list(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        return PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            {'course_id': 1}
+        )
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_to_records(self, m):
+        pag_list = self.make_list(m)
+        self.assertEqual(pag_list[0].id, '1')
+
+        records = pag_list.to_records(batch_size=4)
+        self.assertEqual(list(records.id), ['1', '2', '3', '4', '5', '6'])
+        self.assertEqual(list(records.course_id), [1] * 6)
+        self.assertEqual(m.call_count, 3)
+
+        self.assertEqual([item.id for item in pag_list], ['1', '2', '3', '4', '5', '6'])
+
+    @unittest.skipIf(pyarrow is None, 'PyArrow is not installed')
+    def test_to_arrow(self, m):
+        table = self.make_list(m).to_arrow(fields=['name'])
+        self.assertEqual(table.column_names, ['name'])
+        self.assertEqual(table.column('name').to_pylist()[5], 'object 6')
+
+    @unittest.skipIf(pyarrow is None, 'PyArrow is not installed')
+    def test_to_parquet(self, m):
+        output = io.BytesIO()
+        self.make_list(m).to_parquet(output, compression='gzip')
+
+        output.seek(0)
+        table = pyarrow.parquet.read_table(output)
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(table.column_names, ['id', 'name', 'course_id'])
+
+    def test_write_ndjson_after_last_page(self, m):
+        pag_list = self.make_list(m)
+        self.assertEqual(len(list(pag_list)), 6)
+
+        output = io.StringIO()
+        self.assertEqual(pag_list.write_ndjson(output), 6)
+        self.assertEqual(m.call_count, 3)
+
+    def test_write_ndjson_list_fields(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            fields=['name']
+        )
+
+        output = io.StringIO()
+        self.assertEqual(pag_list.write_ndjson(output), 6)
+        self.assertEqual(json.loads(output.getvalue().splitlines()[0]), {'name': 'object 1'})
+
+    def test_write_ndjson(self, m):
+        pag_list = self.make_list(m)
+        self.assertEqual(pag_list[0].id, '1')
+
+        output = io.StringIO()
+        self.assertEqual(pag_list.write_ndjson(output, fields=['id', 'course_id']), 6)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(json.loads(lines[0]), {'id': '1', 'course_id': 1})
+        self.assertEqual(json.loads(lines[5]), {'id': '6', 'course_id': 1})
@@ -0,0 +1,80 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import unittest
+
+from canvasapi.identity_map import IdentityMap
+
+
+class TestIdentityMap(unittest.TestCase):
+
+    def setUp(self):
+        self.identity_map = IdentityMap(max_entities=3)
+
+    def make_enrollment(self, enrollment_id, user_name='John Doe'):
+        # Build strings at runtime so that equal values are distinct objects.
+        return {
+            'id': enrollment_id,
+            'enrollment_state': ''.join(['act', 'ive']),
+            'user': {'id': 1, 'name': ''.join(['John ', user_name[5:]])},
+            'sections': [{'id': 2}, {'id': 3}],
+            'grades': {'current_score': 90}
+        }
+
+    # dedupe()
+    def test_dedupe_entities(self):
+        first = self.identity_map.dedupe(self.make_enrollment(1))
+        second = self.identity_map.dedupe(self.make_enrollment(2))
+
+        self.assertIsNot(first, second)
+        self.assertIs(first['user'], second['user'])
+        self.assertIs(first['sections'][1], second['sections'][1])
+        self.assertIsNot(first['grades'], second['grades'])
+        self.assertEqual(len(self.identity_map), 3)
+        self.assertEqual(self.identity_map.hits, 3)
+
+    def test_dedupe_changed_entity(self):
+        first = self.identity_map.dedupe(self.make_enrollment(1))
+        second = self.identity_map.dedupe(self.make_enrollment(2, 'John Smith'))
+        third = self.identity_map.dedupe(self.make_enrollment(3, 'John Smith'))
+
+        self.assertEqual(first['user']['name'], 'John Doe')
+        self.assertEqual(second['user']['name'], 'John Smith')
+        self.assertIs(second['user'], third['user'])
+
+    def test_dedupe_strings(self):
+        first = self.identity_map.dedupe(self.make_enrollment(1))
+        second = self.identity_map.dedupe(self.make_enrollment(2))
+
+        self.assertIs(first['enrollment_state'], second['enrollment_state'])
+        self.assertIsNot(
+            self.identity_map.dedupe({'name': ''.join(['John ', 'Doe'])})['name'],
+            self.identity_map.dedupe({'name': ''.join(['John ', 'Doe'])})['name']
+        )
+
+    def test_max_entities(self):
+        first = self.identity_map.dedupe(self.make_enrollment(1))
+        second = self.identity_map.dedupe({'user': {'id': 1, 'name': 'John Doe'}})
+        self.identity_map.dedupe({'course': {'id': 5}})
+        self.assertEqual(len(self.identity_map), 3)
+
+        third = self.identity_map.dedupe(self.make_enrollment(2))
+        self.assertIs(first['user'], second['user'])
+        self.assertIs(first['user'], third['user'])
+        self.assertIsNot(first['sections'][0], third['sections'][0])
+        self.assertEqual(len(self.identity_map), 3)
+
+    def test_max_strings(self):
+        identity_map = IdentityMap(max_strings=1)
+        first = identity_map.dedupe({'workflow_state': ''.join(['act', 'ive'])})
+        second = identity_map.dedupe({'workflow_state': ''.join(['act', 'ive'])})
+
+        self.assertIs(list(first)[0], list(second)[0])
+        self.assertIsNot(first['workflow_state'], second['workflow_state'])
+
+    # clear()
+    def test_clear(self):
+        first = self.identity_map.dedupe(self.make_enrollment(1))
+        self.identity_map.clear()
+        second = self.identity_map.dedupe(self.make_enrollment(2))
+
+        self.assertEqual(len(self.identity_map), 3)
+        self.assertIsNot(first['user'], second['user'])
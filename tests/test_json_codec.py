@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+import json
+import pickle
+import sys
+import types
+import unittest
+
+import requests_mock
+from six import text_type
+
+from canvasapi import Canvas
+from canvasapi.canvas_object import CanvasObject
+from canvasapi.json_codec import JSONCodec, get_codec
+from tests import settings
+from tests.util import register_uris
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class TestGetCodec(unittest.TestCase):
+
+    DATA = {'id': 1, 'name': 'Ünïcödé', 'url': 'http://example.com/a', 'items': [1.5, None, True]}
+
+    def check_round_trip(self, codec):
+        encoded = codec.dumps(self.DATA)
+        self.assertIsInstance(encoded, text_type)
+        self.assertEqual(codec.loads(encoded), self.DATA)
+        self.assertEqual(codec.loads(encoded.encode('utf-8')), self.DATA)
+
+    def test_json(self):
+        codec = get_codec('json')
+        self.assertEqual(codec.name, 'json')
+        self.check_round_trip(codec)
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson(self):
+        codec = get_codec('orjson')
+        self.assertEqual(codec.name, 'orjson')
+        self.check_round_trip(codec)
+
+    @unittest.skipIf(ujson is None, 'ujson is not installed')
+    def test_ujson(self):
+        codec = get_codec('ujson')
+        self.assertEqual(codec.name, 'ujson')
+        self.check_round_trip(codec)
+
+    def test_auto(self):
+        expected = 'orjson' if orjson else 'ujson' if ujson else 'json'
+        self.assertEqual(get_codec().name, expected)
+
+    def test_pickle(self):
+        for name in ('auto', 'json'):
+            codec = pickle.loads(pickle.dumps(get_codec(name)))
+            self.assertEqual(codec.name, get_codec(name).name)
+            self.check_round_trip(codec)
+
+    def test_pickle_custom(self):
+        codec = pickle.loads(pickle.dumps(JSONCodec('custom', len, repr)))
+
+        self.assertEqual(codec.name, 'custom')
+        self.assertIs(codec.loads, len)
+        self.assertIs(codec.dumps, repr)
+
+    def test_auto_fallback(self):
+        with replaced_modules(orjson=None, ujson=None):
+            self.assertEqual(get_codec().name, 'json')
+
+        with replaced_modules(orjson=None, ujson=fake_ujson()):
+            codec = get_codec()
+            self.assertEqual(codec.name, 'ujson')
+            self.check_round_trip(codec)
+
+    def test_repr(self):
+        self.assertEqual(repr(get_codec('json')), '<JSONCodec json>')
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_codec('simplejson2')
+
+
+def fake_ujson():
+    """
+    Return a stand-in for ujson whose dumps returns bytes, as some
+    versions do on Python 2.
+    """
+    module = types.ModuleType(str('ujson'))
+    module.loads = json.loads
+    module.dumps = lambda obj, **kwargs: json.dumps(obj).encode('utf-8')
+    return module
+
+
+class replaced_modules(object):
+    """
+    Replace modules in `sys.modules` while in use. A module replaced by
+    `None` cannot be imported.
+    """
+
+    def __init__(self, **modules):
+        self.modules = modules
+        self.saved = {}
+
+    def __enter__(self):
+        for name, module in self.modules.items():
+            self.saved[name] = sys.modules.get(name)
+            sys.modules[name] = module
+
+    def __exit__(self, *exc_info):
+        for name, module in self.saved.items():
+            if module is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = module
+
+
+@requests_mock.Mocker()
+class TestRequesterCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        def loads(data):
+            self.calls.append(data)
+            return get_codec('json').loads(data)
+
+        self.codec = JSONCodec('custom', loads, lambda obj: 'encoded')
+
+    def test_response_json(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, json_codec=self.codec)
+
+        course = canvas.get_course(1)
+
+        self.assertEqual(course.name, 'Test Course 1234')
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(course.to_json(), 'encoded')
+
+    def test_codec_by_name(self, m):
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, json_codec='json')
+        self.assertEqual(canvas._Canvas__requester.json_codec.name, 'json')
+
+    def test_to_json_without_requester(self, m):
+        canvas_obj = CanvasObject(None, {'id': 1})
+        self.assertEqual(get_codec('json').loads(canvas_obj.to_json()), {'id': 1})
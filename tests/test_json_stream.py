@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+import json
+import unittest
+
+from canvasapi.json_stream import iter_json_array
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+
+    DOCUMENTS = [
+        [],
+        [1],
+        [1, 22, 333],
+        [{'id': 1, 'name': 'Ünïcödé ✓', 'scores': [1.5, -2e-3, None, True]}] * 4,
+        [12345678901234567890, -1.5e10, 'a string', False, None, {}, []],
+    ]
+
+    def test_chunk_boundaries(self):
+        for document in self.DOCUMENTS:
+            for indent in (None, 2):
+                data = json.dumps(document, indent=indent, ensure_ascii=False).encode('utf-8')
+                for size in (1, 2, 3, 7, 64, len(data) + 1):
+                    self.assertEqual(
+                        list(iter_json_array(chunked(data, size))),
+                        document
+                    )
+
+    def test_incremental(self):
+        chunks = iter([b'[{"id": 1}, ', b'{"id": 2}', b']'])
+        elements = iter_json_array(chunks)
+
+        self.assertEqual(next(elements), {'id': 1})
+        self.assertEqual(next(chunks), b'{"id": 2}')
+
+    def test_encoding(self):
+        data = json.dumps(['é'], ensure_ascii=False).encode('utf-16')
+        self.assertEqual(list(iter_json_array(chunked(data, 3), encoding='utf-16')), ['é'])
+
+    def test_invalid(self):
+        for data in (b'', b'{}', b'[1,]', b'[1 2]', b'[1', b'[1] 2', b'[1x]', b'[{"a": }]'):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(chunked(data, 2)))
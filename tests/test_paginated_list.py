@@ -1,11 +1,17 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+from datetime import datetime
+import json
 import unittest
 
 import requests_mock
 
 from canvasapi import Canvas
+from canvasapi.canvas_object import CompactRecord
+from canvasapi.exceptions import CanvasException
+from canvasapi.identity_map import IdentityMap
 from canvasapi.paginated_list import PaginatedList
 from canvasapi.user import User
+from canvasapi.util import combine_kwargs
 from tests import settings
 from tests.util import register_uris
 
@@ -205,3 +211,728 @@ class TestPaginatedList(unittest.TestCase):
             'six_objects_three_pages'
         )
         self.assertEqual(pag_list.__repr__(), '<PaginatedList of type User>')
+
+    # concurrency
+    def test_concurrency(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages',
+            concurrency=4
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5'])
+        self.assertEqual(m.call_count, 3)
+
+    def test_concurrency_requester_default(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        self.requester.page_concurrency = 2
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages'
+        )
+        self.assertEqual(pag_list[4].id, '5')
+        self.assertEqual(m.call_count, 3)
+
+    def test_concurrency_without_last_link(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            concurrency=4
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual(len(item_list), 6)
+        self.assertEqual(item_list[5].id, '6')
+
+    def test_concurrency_bookmark_next_link(self, m):
+        url = settings.BASE_URL + 'bookmarked'
+        for page, bookmark in ((1, None), (2, 'bookmark:2'), (3, 'bookmark:3')):
+            links = ['<%s?page=3&per_page=1>; rel="last"' % (url)]
+            if page < 3:
+                links.append('<%s?page=bookmark:%s>; rel="next"' % (url, page + 1))
+            m.register_uri(
+                'GET',
+                url if bookmark is None else '%s?page=%s' % (url, bookmark),
+                json=[{'id': str(page), 'name': 'object %s' % (page)}],
+                headers={'Link': ', '.join(links)}
+            )
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'bookmarked',
+            concurrency=4
+        )
+        self.assertEqual([item.id for item in pag_list], ['1', '2', '3'])
+        self.assertIsNone(pag_list._PaginatedList__executor)
+        self.assertEqual(
+            [request.qs.get('page') for request in m.request_history],
+            [None, ['bookmark:2'], ['bookmark:3']]
+        )
+
+    # stream_json
+    def test_stream_json(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            stream_json=True
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5', '6'])
+        self.assertIsInstance(item_list[0], User)
+        self.assertEqual(pag_list[3].id, '4')
+
+    def test_stream_json_resume(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        self.requester.stream_json = True
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        first = next(iter(pag_list))
+        self.assertEqual(first.id, '1')
+
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5', '6'])
+        self.assertEqual(m.call_count, 3)
+
+    def test_stream_json_concurrency(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages',
+            concurrency=2,
+            stream_json=True
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5'])
+
+    # compact
+    def test_compact(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            compact=True
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5', '6'])
+        self.assertIsInstance(item_list[0], User)
+        self.assertIsInstance(item_list[0], CompactRecord)
+        self.assertIs(item_list[0]._keys, item_list[5]._keys)
+
+    def test_compact_requester_default(self, m):
+        register_uris({'paginated_list': ['single']}, m)
+
+        self.requester.compact_records = True
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'single_item'
+        )
+        self.assertIsInstance(pag_list[0], CompactRecord)
+
+    # raw
+    def test_raw(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            {'course_id': 1},
+            raw=True
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual(item_list[0], {'id': '1', 'name': 'object 1'})
+        self.assertEqual(pag_list[5]['id'], '6')
+
+        user = pag_list.upgrade(item_list[0])
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.id, '1')
+        self.assertEqual(user.course_id, 1)
+        self.assertNotIn('course_id', item_list[0])
+
+    def test_raw_requester_default(self, m):
+        register_uris({'paginated_list': ['single']}, m)
+
+        self.requester.raw_lists = True
+        self.requester.compact_records = True
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'single_item'
+        )
+        self.assertIsInstance(pag_list[0], dict)
+        self.assertIsInstance(pag_list.upgrade(pag_list[0]), CompactRecord)
+
+    # fields
+    def test_fields(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            {'course_id': 1},
+            fields=['id', 'missing']
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5', '6'])
+        self.assertEqual(item_list[0].attributes, {'id': '1', 'course_id': 1})
+        self.assertFalse(hasattr(item_list[0], 'name'))
+        self.assertFalse(hasattr(item_list[0], 'missing'))
+
+    def test_fields_requester_default(self, m):
+        register_uris({'paginated_list': ['single']}, m)
+
+        self.requester.list_fields = {'User': ['name']}
+        self.requester.raw_lists = True
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'single_item'
+        )
+        self.assertEqual(list(pag_list[0]), ['name'])
+
+    # identity_map
+    def test_identity_map(self, m):
+        register_uris({'paginated_list': ['nested_entities']}, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'nested_entities',
+            identity_map=True
+        )
+        item_list = [item for item in pag_list]
+        self.assertIs(item_list[0].user, item_list[1].user)
+        self.assertIs(item_list[0].workflow_state, item_list[1].workflow_state)
+
+    def test_identity_map_requester_default(self, m):
+        register_uris({'paginated_list': ['nested_entities']}, m)
+
+        self.requester.identity_map = IdentityMap()
+        first = PaginatedList(User, self.requester, 'GET', 'nested_entities')[0]
+        second = PaginatedList(User, self.requester, 'GET', 'nested_entities')[0]
+        self.assertIs(first.user, second.user)
+        self.assertEqual(len(self.requester.identity_map), 1)
+
+    # stream()
+    def test_stream(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        self.assertEqual(pag_list[2].id, '3')
+
+        stream = pag_list.stream()
+        self.assertEqual([next(stream).id for _ in range(3)], ['1', '2', '3'])
+        with self.assertRaises(IndexError):
+            pag_list[2]
+        self.assertEqual(pag_list[3].id, '4')
+
+        self.assertEqual([item.id for item in pag_list.stream()], ['4', '5', '6'])
+        self.assertEqual(list(pag_list), [])
+        self.assertEqual(m.call_count, 3)
+
+    def test_stream_buffered(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        self.assertEqual(pag_list[3].id, '4')
+
+        stream = pag_list.stream()
+        self.assertEqual(next(stream).id, '1')
+        self.assertEqual([item.id for item in pag_list], ['2', '3', '4', '5', '6'])
+        self.assertEqual(pag_list[1].id, '2')
+
+        self.assertEqual([item.id for item in stream], ['2', '3', '4', '5', '6'])
+        self.assertEqual(len(pag_list._PaginatedList__elements), 0)
+
+    def test_retain_false(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            retain=False
+        )
+        for item in pag_list:
+            if item.id == '2':
+                break
+
+        self.assertEqual([item.id for item in pag_list[3:5]], ['4', '5'])
+        with self.assertRaises(IndexError):
+            list(pag_list[1:])
+        self.assertEqual([item.id for item in pag_list], ['6'])
+
+    # total_count()
+    def test_total_count(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages'
+        )
+        self.assertEqual(pag_list.total_count(), 5)
+        self.assertEqual(len(pag_list), 5)
+        self.assertEqual(m.call_count, 2)
+
+        item_list = list(pag_list)
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5'])
+        self.assertEqual(m.call_count, 3)
+
+    def test_total_count_without_last_link(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        with self.assertRaises(TypeError):
+            len(pag_list)
+        with self.assertRaises(TypeError):
+            len(pag_list)
+        self.assertEqual(m.call_count, 1)
+
+        self.assertEqual(pag_list.total_count(), 6)
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(len(pag_list), 6)
+
+    def test_list_without_last_link(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        self.assertEqual(len(list(pag_list)), 6)
+        self.assertEqual(m.call_count, 3)
+
+    def test_total_count_retain_false(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            retain=False
+        )
+        with self.assertRaises(TypeError):
+            len(pag_list)
+        self.assertEqual(pag_list.total_count(), 6)
+        self.assertEqual(len(pag_list._PaginatedList__elements), 2)
+        self.assertEqual(m.call_count, 3)
+
+        self.assertEqual(pag_list.total_count(), 6)
+        self.assertEqual([item.id for item in pag_list], ['1', '2', '3', '4', '5', '6'])
+        self.assertEqual(m.call_count, 5)
+
+    def test_list_retain_false(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            retain=False
+        )
+        self.assertEqual([item.id for item in list(pag_list)], ['1', '2', '3', '4', '5', '6'])
+        self.assertEqual(m.call_count, 3)
+
+    def test_total_count_list_order(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages'
+        )
+        self.assertEqual(len(list(pag_list)), 5)
+        self.assertEqual(
+            [request.qs.get('page') for request in m.request_history],
+            [None, ['3'], ['2']]
+        )
+
+    def test_total_count_last_link_without_page_numbers(self, m):
+        url = settings.BASE_URL + 'bookmarked'
+        m.register_uri(
+            'GET',
+            url,
+            json=[{'id': '1', 'name': 'object 1'}],
+            headers={'Link': '<{0}?page=bookmark:2>; rel="next", '
+                             '<{0}?page=bookmark:2>; rel="last"'.format(url)}
+        )
+        m.register_uri(
+            'GET',
+            url + '?page=bookmark:2',
+            json=[{'id': '2', 'name': 'object 2'}]
+        )
+
+        pag_list = PaginatedList(User, self.requester, 'GET', 'bookmarked')
+        with self.assertRaises(TypeError):
+            len(pag_list)
+        self.assertEqual(m.call_count, 1)
+
+        self.assertEqual(pag_list.total_count(), 2)
+        self.assertEqual(m.call_count, 2)
+
+    def test_total_count_last_link_without_per_page(self, m):
+        url = settings.BASE_URL + 'unsized'
+        m.register_uri(
+            'GET',
+            url,
+            json=[{'id': '1', 'name': 'object 1'}],
+            headers={'Link': '<{0}?page=2>; rel="next", <{0}?page=2>; rel="last"'.format(url)}
+        )
+        m.register_uri(
+            'GET',
+            url + '?page=2',
+            json=[{'id': '2', 'name': 'object 2'}]
+        )
+
+        pag_list = PaginatedList(User, self.requester, 'GET', 'unsized')
+        with self.assertRaises(TypeError):
+            len(pag_list)
+        self.assertEqual([item.id for item in pag_list], ['1', '2'])
+        self.assertEqual(m.call_count, 2)
+
+    def test_total_count_concurrency_reuses_prefetched_last_page(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages',
+            concurrency=2
+        )
+        self.assertEqual(len(pag_list), 5)
+
+        item_list = list(pag_list)
+        self.assertEqual([item.id for item in item_list], ['1', '2', '3', '4', '5'])
+        self.assertIs(pag_list[-1], item_list[-1])
+        self.assertEqual(m.call_count, 3)
+
+    def test_total_count_concurrency_last_page_not_requested_twice(self, m):
+        register_numbered_pages(m, 'eleven_objects', 11, per_page=2)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'eleven_objects',
+            concurrency=2
+        )
+        item_list = list(pag_list)
+
+        self.assertEqual([item.id for item in item_list], [str(i) for i in range(1, 12)])
+        self.assertIs(pag_list[-1], item_list[-1])
+        self.assertEqual(
+            sorted(request.qs.get('page', ['1'])[0] for request in m.request_history),
+            ['1', '2', '3', '4', '5', '6']
+        )
+
+    def test_bool(self, m):
+        register_uris({'paginated_list': ['empty', 'single']}, m)
+
+        self.assertFalse(PaginatedList(User, self.requester, 'GET', 'empty_list'))
+        self.assertTrue(PaginatedList(User, self.requester, 'GET', 'single_item'))
+
+    # negative indices
+    def test_getitem_negative(self, m):
+        requires = {
+            'paginated_list': ['5_3_pages_p1', '5_3_pages_p2', '5_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'five_objects_three_pages'
+        )
+        self.assertEqual(pag_list[-1].id, '5')
+        self.assertEqual(m.call_count, 2)
+
+        self.assertEqual(pag_list[-3].id, '3')
+        self.assertEqual(m.call_count, 3)
+
+        with self.assertRaises(IndexError):
+            pag_list[-6]
+
+    def test_slice_negative(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        self.assertEqual([item.id for item in pag_list[-2:]], ['5', '6'])
+        self.assertEqual([item.id for item in pag_list[1:-3]], ['2', '3'])
+
+    def test_slice_past_end(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages'
+        )
+        self.assertEqual([item.id for item in pag_list[4:]], ['5', '6'])
+        self.assertEqual([item.id for item in pag_list[4:10]], ['5', '6'])
+
+    # cursor
+    def test_cursor(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            {'course_id': 1},
+            _kwargs=[('include[]', 'email')]
+        )
+        self.assertEqual(pag_list.cursor['url'], 'six_objects_three_pages')
+        self.assertEqual(pag_list.cursor['params']['_kwargs'], [('include[]', 'email')])
+
+        stream = pag_list.stream()
+        self.assertEqual([next(stream).id for _ in range(3)], ['1', '2', '3'])
+        cursor = pag_list.cursor
+        self.assertEqual(cursor['url'], 'six_objects_three_pages?page=2&per_page=2')
+        self.assertEqual(cursor['skip'], 1)
+        self.assertEqual(cursor['index'], 3)
+
+        resumed = PaginatedList.from_cursor(User, self.requester, cursor)
+        self.assertEqual([item.id for item in resumed], ['4', '5', '6'])
+
+        list(stream)
+        self.assertIsNone(pag_list.cursor['url'])
+        self.assertEqual(pag_list.cursor['index'], 6)
+
+    def test_cursor_dates(self, m):
+        register_uris({'paginated_list': ['2_1_page']}, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'two_objects_one_page',
+            _kwargs=combine_kwargs(start_time=datetime(2012, 5, 5))
+        )
+        cursor = json.loads(json.dumps(pag_list.cursor))
+        self.assertEqual(cursor['params']['_kwargs'], [['start_time', '2012-05-05T00:00:00']])
+
+        resumed = PaginatedList.from_cursor(User, self.requester, cursor)
+        self.assertEqual([item.id for item in resumed], ['1', '2'])
+        self.assertEqual(m.last_request.qs['start_time'], ['2012-05-05t00:00:00'])
+
+    def test_from_cursor(self, m):
+        requires = {
+            'paginated_list': ['6_3_pages_p1', '6_3_pages_p2', '6_3_pages_p3']
+        }
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'six_objects_three_pages',
+            {'course_id': 1}
+        )
+        pag_list[2]
+        cursor = json.loads(json.dumps(pag_list.cursor))
+
+        self.assertEqual(cursor['index'], 4)
+
+        resumed = PaginatedList.from_cursor(User, self.requester, cursor)
+        self.assertEqual(resumed.cursor, cursor)
+        self.assertEqual(resumed[4].id, '5')
+        self.assertEqual(resumed[4].course_id, 1)
+        self.assertEqual([item.id for item in resumed.stream()], ['5', '6'])
+        with self.assertRaises(IndexError):
+            resumed[3]
+        self.assertEqual(m.call_count, 3)
+
+    # next links
+    def test_next_link_other_host(self, m):
+        register_uris({'paginated_list': ['other_host_p1']}, m)
+        m.register_uri(
+            'GET',
+            'https://cdn.example.org/api/v1/other_host?page=2&per_page=1',
+            json=[{'id': '2', 'name': 'object 2'}]
+        )
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            'GET',
+            'other_host'
+        )
+        item_list = [item for item in pag_list]
+        self.assertEqual([item.id for item in item_list], ['1', '2'])
+        self.assertEqual(m.last_request.netloc, 'cdn.example.org')
+        self.assertIn('Authorization', m.request_history[0].headers)
+        self.assertNotIn('Authorization', m.last_request.headers)
+
+    def test_next_link_insecure(self, m):
+        m.register_uri(
+            'GET',
+            'https://example.com/api/v1/insecure',
+            json=[{'id': '1', 'name': 'object 1'}],
+            headers={'Link': '<http://example.com/api/v1/insecure?page=2>; rel="next"'}
+        )
+        canvas = Canvas('https://example.com/api/v1/', settings.API_KEY)
+
+        pag_list = PaginatedList(User, canvas._Canvas__requester, 'GET', 'insecure')
+        with self.assertRaises(CanvasException):
+            list(pag_list)
+        self.assertEqual(m.call_count, 1)
+
+
+def register_numbered_pages(m, endpoint, count, per_page):
+    """
+    Register a list of `count` users split into pages of `per_page`,
+    linked by page number.
+    """
+    url = settings.BASE_URL + endpoint
+    pages = (count + per_page - 1) // per_page
+
+    def link(page, rel):
+        return '<%s?page=%s&per_page=%s>; rel="%s"' % (url, page, per_page, rel)
+
+    for page in range(1, pages + 1):
+        links = [link(pages, 'last')]
+        if page < pages:
+            links.append(link(page + 1, 'next'))
+        first = (page - 1) * per_page + 1
+        m.register_uri(
+            'GET',
+            url if page == 1 else '%s?page=%s&per_page=%s' % (url, page, per_page),
+            json=[
+                {'id': str(i), 'name': 'object %s' % (i)}
+                for i in range(first, min(first + per_page, count + 1))
+            ],
+            headers={'Link': ', '.join(links)}
+        )
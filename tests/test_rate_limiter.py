@@ -0,0 +1,90 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
+import pickle
+import unittest
+
+from canvasapi.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.delays = []
+        self.limiter = RateLimiter(
+            threshold=50.0,
+            leak_rate=10.0,
+            max_delay=30.0,
+            clock=lambda: self.now,
+            sleep=self.delays.append
+        )
+
+    # acquire()
+    def test_acquire_no_information(self):
+        self.assertEqual(self.limiter.acquire(), 0.0)
+        self.assertIsNone(self.limiter.remaining)
+        self.assertEqual(self.delays, [])
+
+    def test_acquire_above_threshold(self):
+        self.limiter.update(0.0, {'X-Rate-Limit-Remaining': '600', 'X-Request-Cost': '2'})
+
+        self.assertEqual(self.limiter.acquire(), 2.0)
+        self.assertEqual(self.delays, [])
+        self.assertEqual(self.limiter.remaining, 598.0)
+
+    def test_acquire_below_threshold(self):
+        self.limiter.update(0.0, {'X-Rate-Limit-Remaining': '45', 'X-Request-Cost': '10'})
+
+        self.limiter.acquire()
+        self.limiter.acquire()
+
+        self.assertEqual(self.delays, [1.5, 2.5])
+        self.assertEqual(self.limiter.total_delay, 4.0)
+
+    def test_acquire_recovers_over_time(self):
+        self.limiter.update(0.0, {'X-Rate-Limit-Remaining': '0'})
+        self.now = 10.0
+
+        self.limiter.acquire()
+        self.assertEqual(self.delays, [])
+
+    def test_acquire_max_delay(self):
+        self.limiter.update(0.0, {'X-Rate-Limit-Remaining': '-1000'})
+
+        self.limiter.acquire()
+        self.assertEqual(self.delays, [30.0])
+
+    # update()
+    def test_update_releases_reservation(self):
+        self.limiter.update(0.0, {'X-Rate-Limit-Remaining': '100', 'X-Request-Cost': '20'})
+
+        reserved = self.limiter.acquire()
+        self.assertEqual(self.limiter.remaining, 80.0)
+
+        self.limiter.update(reserved)
+        self.assertEqual(self.limiter.remaining, 100.0)
+
+    def test_update_averages_cost(self):
+        self.limiter.update(0.0, {'X-Request-Cost': '10'})
+        self.limiter.update(0.0, {'X-Request-Cost': '20'})
+
+        self.assertEqual(self.limiter.acquire(), 12.0)
+
+    # throttled()
+    def test_throttled(self):
+        self.limiter.update(0.0, {'X-Rate-Limit-Remaining': '600'})
+        self.limiter.throttled()
+
+        self.limiter.acquire()
+        self.assertEqual(self.delays, [5.0])
+
+    # copying
+    def test_copy(self):
+        limiter = RateLimiter(threshold=20.0)
+        limiter.update(0.0, {'X-Rate-Limit-Remaining': '600', 'X-Request-Cost': '2'})
+
+        for copied in (pickle.loads(pickle.dumps(limiter)), copy.deepcopy(limiter)):
+            self.assertEqual(copied.threshold, 20.0)
+            self.assertEqual(copied._remaining, 600.0)
+            self.assertIsNot(copied._lock, limiter._lock)
+            self.assertEqual(copied.acquire(), 2.0)
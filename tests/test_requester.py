@@ -1,16 +1,29 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from datetime import datetime
+import json
+import pickle
+import threading
+import time
 import unittest
 
 import requests
+from requests.adapters import HTTPAdapter
 import requests_mock
-from six.moves.urllib.parse import quote
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.urllib.parse import parse_qsl, quote, urlsplit
 
-from canvasapi import Canvas
+from canvasapi import Canvas, requester as requester_module
+from canvasapi.course import Course
 from canvasapi.exceptions import (
-    BadRequest, CanvasException, InvalidAccessToken, ResourceDoesNotExist,
-    Unauthorized
+    BadRequest, CanvasException, Forbidden, InvalidAccessToken,
+    RateLimitExceeded, ResourceDoesNotExist, Unauthorized
 )
+from canvasapi.rate_limiter import RateLimiter
+from canvasapi.requester import Requester
+from canvasapi.retry import Retry
 from tests import settings
 from tests.util import register_uris
 
@@ -95,6 +108,22 @@ class TestRequester(unittest.TestCase):
         with self.assertRaises(Unauthorized):
             self.requester.request('GET', '401_unauthorized')
 
+    def test_request_403(self, m):
+        register_uris({'requests': ['403']}, m)
+
+        with self.assertRaises(Forbidden):
+            self.requester.request('GET', '403')
+
+    def test_request_403_RateLimitExceeded(self, m):
+        register_uris({'requests': ['403_rate_limit']}, m)
+
+        limiter = RateLimiter(sleep=lambda delay: None)
+        self.requester.rate_limiter = limiter
+
+        with self.assertRaises(RateLimitExceeded):
+            self.requester.request('GET', '403_rate_limit')
+        self.assertLessEqual(limiter.remaining, 0.1)
+
     def test_request_404(self, m):
         register_uris({'requests': ['404']}, m)
 
@@ -106,3 +135,458 @@ class TestRequester(unittest.TestCase):
 
         with self.assertRaises(CanvasException):
             self.requester.request('GET', '500')
+
+    def test_request_503(self, m):
+        m.register_uri('GET', settings.BASE_URL + '503', status_code=503)
+
+        with self.assertRaises(CanvasException):
+            self.requester.request('GET', '503')
+
+    def test_request_429(self, m):
+        m.register_uri('GET', settings.BASE_URL + '429', status_code=429)
+
+        with self.assertRaises(RateLimitExceeded):
+            self.requester.request('GET', '429')
+
+    # rate_limiter
+    def test_request_rate_limiter(self, m):
+        register_uris({'requests': ['rate_limit_headers']}, m)
+
+        delays = []
+        limiter = RateLimiter(threshold=50.0, clock=lambda: 0.0, sleep=delays.append)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, rate_limiter=limiter)
+        requester = canvas._Canvas__requester
+
+        requester.request('GET', 'rate_limit_headers')
+        self.assertEqual(delays, [])
+        self.assertEqual(limiter.remaining, 40.0)
+
+        requester.request('GET', 'rate_limit_headers')
+        self.assertEqual(delays, [1.5])
+
+    def test_request_rate_limiter_error(self, m):
+        register_uris({'requests': ['rate_limit_headers']}, m)
+        m.register_uri('GET', settings.BASE_URL + 'unreachable', exc=requests.ConnectionError)
+
+        limiter = RateLimiter(clock=lambda: 0.0, sleep=lambda delay: None)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, rate_limiter=limiter)
+        requester = canvas._Canvas__requester
+
+        requester.request('GET', 'rate_limit_headers')
+        self.assertGreater(limiter._cost, 0)
+
+        with self.assertRaises(requests.ConnectionError):
+            requester.request('GET', 'unreachable')
+        self.assertEqual(limiter._reserved, 0)
+        self.assertEqual(limiter.remaining, 40.0)
+
+    # retry
+    def test_request_retry(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'flaky', [
+            {'status_code': 503},
+            {'status_code': 500},
+            {'json': {'id': 1}, 'status_code': 200},
+        ])
+        delays = []
+        retry = Retry(total=3, jitter=False, sleep=delays.append)
+        self.requester.retry = retry
+
+        response = self.requester.request('GET', 'flaky')
+        self.assertEqual(response.json(), {'id': 1})
+        self.assertEqual(delays, [0.5, 1.0])
+        self.assertEqual(retry.retries, 2)
+        self.assertEqual(retry.retries_by_reason, {'503': 1, '500': 1})
+
+    def test_request_retry_closes_response(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'flaky', [
+            {'status_code': 503},
+            {'json': {'id': 1}, 'status_code': 200},
+        ])
+        retried = []
+
+        class RecordingRetry(Retry):
+            def wait(self, attempt, response=None, error=None):
+                retried.append(response)
+
+        self.requester.retry = RecordingRetry()
+
+        self.requester.request('GET', 'flaky', _stream=True)
+        self.assertEqual(len(retried), 1)
+        self.assertTrue(retried[0].raw.closed)
+
+    def test_request_retry_exhausted(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'down', status_code=502)
+        retry = Retry(total=2, sleep=lambda delay: None)
+        self.requester.retry = retry
+
+        with self.assertRaises(CanvasException):
+            self.requester.request('GET', 'down')
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(retry.retries, 2)
+
+    def test_request_retry_post_not_retried(self, m):
+        m.register_uri('POST', settings.BASE_URL + 'down', status_code=503)
+        self.requester.retry = Retry(sleep=lambda delay: None)
+
+        with self.assertRaises(CanvasException):
+            self.requester.request('POST', 'down')
+        self.assertEqual(m.call_count, 1)
+
+    def test_request_retry_throttled(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'throttled', [
+            {'text': '403 Forbidden (Rate Limit Exceeded)', 'status_code': 403},
+            {'json': {}, 'status_code': 200},
+        ])
+        delays = []
+        self.requester.retry = Retry(sleep=delays.append)
+
+        response = self.requester.request('GET', 'throttled')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(delays), 1)
+
+    def test_request_retry_after(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'busy', [
+            {'headers': {'Retry-After': '7'}, 'status_code': 429},
+            {'json': {}, 'status_code': 200},
+        ])
+        delays = []
+        self.requester.retry = Retry(sleep=delays.append)
+
+        self.requester.request('GET', 'busy')
+        self.assertEqual(delays, [7.0])
+
+    def test_request_retry_connection_error(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'unreachable', [
+            {'exc': requests.ConnectionError},
+            {'json': {}, 'status_code': 200},
+        ])
+        retry = Retry(sleep=lambda delay: None)
+        self.requester.retry = retry
+
+        response = self.requester.request('GET', 'unreachable')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(retry.retries_by_reason, {'ConnectionError': 1})
+
+    def test_request_retry_connection_error_exhausted(self, m):
+        m.register_uri('GET', settings.BASE_URL + 'unreachable', exc=requests.ConnectionError)
+        retry = Retry(total=2, sleep=lambda delay: None)
+        self.requester.retry = retry
+
+        with self.assertRaises(requests.ConnectionError):
+            self.requester.request('GET', 'unreachable')
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(retry.retries_by_reason, {'ConnectionError': 2})
+
+    def test_request_retry_bool(self, m):
+        requester = Canvas(settings.BASE_URL, settings.API_KEY, retry=True)._Canvas__requester
+        self.assertIsInstance(requester.retry, Retry)
+        self.assertEqual(requester.retry.total, Retry().total)
+
+        requester = Canvas(settings.BASE_URL, settings.API_KEY, retry=False)._Canvas__requester
+        self.assertIsNone(requester.retry)
+
+    def test_request_retry_int(self, m):
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, retry=5)
+        requester = canvas._Canvas__requester
+
+        self.assertIsInstance(requester.retry, Retry)
+        self.assertEqual(requester.retry.total, 5)
+
+    # coalesce_requests
+    def count_waiters(self):
+        """
+        Record each caller that starts waiting for a coalesced call made
+        by another thread, and return the list of records.
+        """
+        waiters = []
+        original = requester_module._Call
+
+        class CountingEvent(object):
+            def __init__(self):
+                self.event = threading.Event()
+
+            def wait(self, timeout=None):
+                waiters.append(threading.current_thread())
+                return self.event.wait(timeout)
+
+            def set(self):
+                self.event.set()
+
+        class CountingCall(original):
+            def __init__(self):
+                original.__init__(self)
+                self.done = CountingEvent()
+
+        requester_module._Call = CountingCall
+        self.addCleanup(setattr, requester_module, '_Call', original)
+        return waiters
+
+    def wait_for_waiters(self, waiters, count):
+        """
+        Wait until `count` callers are waiting for a coalesced call, so
+        that none of them can arrive after it has completed.
+        """
+        deadline = time.time() + 5
+        while len(waiters) < count:
+            if time.time() > deadline:
+                self.fail('Only some callers joined the coalesced call.')
+            time.sleep(0.01)
+
+    def test_coalesce_requests(self, m):
+        release = threading.Event()
+
+        def slow_response(request, context):
+            release.wait(5)
+            return {'id': 1}
+
+        m.register_uri('GET', settings.BASE_URL + 'courses/1', json=slow_response)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, coalesce_requests=True)
+        waiters = self.count_waiters()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(canvas.get_course, 1) for _ in range(8)]
+            self.wait_for_waiters(waiters, 7)
+            release.set()
+            courses = [future.result() for future in futures]
+
+        self.assertEqual(m.call_count, 1)
+        self.assertTrue(all(course.id == 1 for course in courses))
+
+        canvas.get_course(1)
+        self.assertEqual(m.call_count, 2)
+
+    def test_coalesce_requests_error(self, m):
+        release = threading.Event()
+
+        def slow_response(request, context):
+            release.wait(5)
+            context.status_code = 404
+            return {}
+
+        m.register_uri('GET', settings.BASE_URL + 'courses/1', json=slow_response)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, coalesce_requests=True)
+        waiters = self.count_waiters()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(canvas.get_course, 1) for _ in range(4)]
+            self.wait_for_waiters(waiters, 3)
+            release.set()
+            for future in futures:
+                self.assertIsInstance(future.exception(), ResourceDoesNotExist)
+
+        self.assertEqual(m.call_count, 1)
+
+    def test_coalesce_requests_distinct(self, m):
+        register_uris({'course': ['get_by_id', 'get_by_id_2']}, m)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, coalesce_requests=True)
+
+        self.assertEqual(canvas.map(canvas.get_course, [1, 2])[1].id, 2)
+        self.assertEqual(m.call_count, 2)
+
+    # connection pool
+    def test_pool_options(self, m):
+        canvas = Canvas(
+            settings.BASE_URL,
+            settings.API_KEY,
+            pool_connections=4,
+            pool_maxsize=32,
+            pool_block=True
+        )
+        adapter = canvas._Canvas__requester._session.adapters['https://']
+
+        self.assertIsInstance(adapter, HTTPAdapter)
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(adapter._pool_block)
+
+    def test_custom_session(self, m):
+        session = requests.Session()
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, session=session)
+
+        self.assertIs(canvas._Canvas__requester._session, session)
+
+    def test_custom_adapter(self, m):
+        adapter = HTTPAdapter(pool_maxsize=64)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, adapter=adapter)
+        session = canvas._Canvas__requester._session
+
+        self.assertIs(session.adapters['http://'], adapter)
+        self.assertIs(session.adapters['https://'], adapter)
+
+    def test_timeout(self, m):
+        register_uris({'requests': ['get', 'post', 'put', 'delete']}, m)
+        self.requester.timeout = (3.05, 27)
+
+        for method in ('GET', 'POST', 'PUT', 'DELETE'):
+            self.requester.request(method, 'fake_%s_request' % method.lower())
+            self.assertEqual(m.last_request.timeout, (3.05, 27))
+
+    def test_pool_stats(self, m):
+        self.assertEqual(self.requester.pool_stats(), {})
+
+    def test_pool_stats_without_pool(self, m):
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, adapter=requests_mock.Adapter())
+        self.assertEqual(canvas._Canvas__requester.pool_stats(), {})
+
+    # copying
+    def test_deepcopy(self, m):
+        course = Course(self.requester, {'id': 1, 'name': 'Course 1'})
+
+        course_copy = copy.deepcopy(course)
+        requester = course_copy._requester
+
+        self.assertEqual(course_copy.name, 'Course 1')
+        self.assertIsNot(requester, self.requester)
+        self.assertEqual(requester.base_url, self.requester.base_url)
+        self.assertEqual(requester.pool_stats(), {})
+
+    def test_pickle(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+        course = Course(self.requester, {'id': 1, 'name': 'Course 1'})
+
+        course_copy = pickle.loads(pickle.dumps(course))
+        response = course_copy._requester.request('GET', 'courses/1')
+
+        self.assertEqual(course_copy.name, 'Course 1')
+        self.assertEqual(course_copy._requester.json_codec.name, self.requester.json_codec.name)
+        self.assertEqual(response.json()['id'], 1)
+
+    def test_deepcopy_session_per_thread(self, m):
+        register_uris({'course': ['get_by_id']}, m)
+        requester = Requester(
+            settings.BASE_URL,
+            settings.API_KEY,
+            session_per_thread=True,
+            coalesce_requests=True
+        )
+        course = Course(requester, {'id': 1, 'name': 'Course 1'})
+
+        requester = copy.deepcopy(course)._requester
+        response = requester.request('GET', 'courses/1')
+
+        self.assertEqual(response.json()['id'], 1)
+        self.assertIsInstance(requester._local, threading.local)
+        self.assertIsNotNone(requester._single_flight)
+        self.assertEqual(len(requester._thread_sessions), 1)
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Respond with the query string and body of each request as JSON."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        payload = json.dumps({
+            'path': self.path,
+            'body': body,
+            'auth': self.headers.get('Authorization'),
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestRequesterThreadSafety(unittest.TestCase):
+
+    THREADS = 16
+    REQUESTS_PER_THREAD = 10
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = _ThreadingHTTPServer(('127.0.0.1', 0), _EchoHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.daemon = True
+        cls.server_thread.start()
+        cls.base_url = 'http://127.0.0.1:%s/api/v1/' % (cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def hammer(self, requester):
+        shared_kwargs = [('shared', 'value')]
+        shared_headers = {'Accept': 'application/json'}
+
+        def work(worker):
+            results = []
+            for i in range(self.REQUESTS_PER_THREAD):
+                get = requester.request(
+                    'GET',
+                    'echo',
+                    headers=shared_headers,
+                    _kwargs=shared_kwargs,
+                    worker=worker,
+                    i=i
+                ).json()
+                post = requester.request(
+                    'POST',
+                    'echo',
+                    _kwargs=shared_kwargs,
+                    worker=worker,
+                    i=i
+                ).json()
+                results.append((i, get, post))
+            return worker, results
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            outcomes = list(executor.map(work, range(self.THREADS)))
+            # Sessions owned by worker threads are released when they exit.
+            stats = requester.pool_stats()
+
+        for worker, results in outcomes:
+            self.assertEqual(len(results), self.REQUESTS_PER_THREAD)
+            for i, get, post in results:
+                query = dict(parse_qsl(urlsplit(get['path']).query))
+                self.assertEqual(query, {'shared': 'value', 'worker': str(worker), 'i': str(i)})
+                self.assertEqual(
+                    dict(parse_qsl(post['body'])),
+                    {'shared': 'value', 'worker': str(worker), 'i': str(i)}
+                )
+                self.assertEqual(get['auth'], 'Bearer %s' % (settings.API_KEY))
+
+        # Shared arguments must be left untouched.
+        self.assertEqual(shared_kwargs, [('shared', 'value')])
+        self.assertEqual(shared_headers, {'Accept': 'application/json'})
+
+        self.assertEqual(len(stats), 1)
+        totals = list(stats.values())[0]
+        self.assertEqual(totals['requests'], self.THREADS * self.REQUESTS_PER_THREAD * 2)
+        self.assertLessEqual(totals['connections'], self.THREADS)
+
+    def test_shared_session(self):
+        requester = Requester(self.base_url, settings.API_KEY, pool_maxsize=self.THREADS)
+        self.hammer(requester)
+
+    def test_session_per_thread(self):
+        requester = Requester(self.base_url, settings.API_KEY, session_per_thread=True)
+        self.hammer(requester)
+
+    def test_session_per_thread_with_session(self):
+        with self.assertRaises(ValueError):
+            Requester(
+                self.base_url,
+                settings.API_KEY,
+                session=requests.Session(),
+                session_per_thread=True
+            )
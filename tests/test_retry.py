@@ -0,0 +1,108 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
+from email.utils import formatdate
+import pickle
+import time
+import unittest
+
+import requests
+
+from canvasapi.retry import Retry, is_throttled, parse_retry_after
+
+
+def make_response(status_code, text='', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+
+class TestRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.retry = Retry(total=3, backoff_factor=1.0, max_backoff=5.0, jitter=False)
+
+    # is_retryable()
+    def test_is_retryable_status(self):
+        self.assertTrue(self.retry.is_retryable('GET', 0, make_response(503)))
+        self.assertFalse(self.retry.is_retryable('GET', 0, make_response(404)))
+
+    def test_is_retryable_method(self):
+        self.assertTrue(self.retry.is_retryable('delete', 0, make_response(500)))
+        self.assertFalse(self.retry.is_retryable('POST', 0, make_response(500)))
+
+    def test_is_retryable_exhausted(self):
+        self.assertFalse(self.retry.is_retryable('GET', 3, make_response(503)))
+
+    def test_is_retryable_error(self):
+        error = requests.ConnectionError()
+        self.assertTrue(self.retry.is_retryable('GET', 0, error=error))
+
+    def test_is_retryable_nothing(self):
+        self.assertFalse(self.retry.is_retryable('GET', 0))
+
+    def test_is_retryable_throttled(self):
+        response = make_response(403, '403 Forbidden (Rate Limit Exceeded)')
+        self.assertTrue(self.retry.is_retryable('GET', 0, response))
+
+        self.retry.retry_throttled = False
+        self.assertFalse(self.retry.is_retryable('GET', 0, response))
+
+    # backoff()
+    def test_backoff_exponential(self):
+        delays = [self.retry.backoff(attempt) for attempt in range(4)]
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 5.0])
+
+    def test_backoff_jitter(self):
+        self.retry.jitter = True
+        for attempt in range(4):
+            self.assertLessEqual(self.retry.backoff(attempt), min(2 ** attempt, 5.0))
+
+    def test_backoff_retry_after(self):
+        response = make_response(503, headers={'Retry-After': '3'})
+        self.assertEqual(self.retry.backoff(0, response), 3.0)
+
+        self.retry.respect_retry_after = False
+        self.assertEqual(self.retry.backoff(0, response), 1.0)
+
+    # wait()
+    def test_wait_counts(self):
+        delays = []
+        retry = Retry(jitter=False, sleep=delays.append)
+
+        retry.wait(0, make_response(503))
+        retry.wait(1, error=requests.Timeout())
+
+        self.assertEqual(delays, [0.5, 1.0])
+        self.assertEqual(retry.retries, 2)
+        self.assertEqual(retry.retries_by_reason, {'503': 1, 'Timeout': 1})
+
+    # copying
+    def test_copy(self):
+        retry = Retry(total=5)
+        retry.retries_by_reason['503'] = retry.retries = 1
+
+        for copied in (pickle.loads(pickle.dumps(retry)), copy.deepcopy(retry)):
+            self.assertEqual(copied.total, 5)
+            self.assertEqual(copied.retries_by_reason, {'503': 1})
+            self.assertIsNot(copied._lock, retry._lock)
+            copied._sleep = lambda delay: None
+            copied.wait(0, make_response(500))
+            self.assertEqual(copied.retries, 2)
+            self.assertEqual(retry.retries, 1)
+
+    # is_throttled()
+    def test_is_throttled(self):
+        self.assertTrue(is_throttled(make_response(429)))
+        self.assertTrue(is_throttled(make_response(403, '(Rate Limit Exceeded)')))
+        self.assertFalse(is_throttled(make_response(403, 'Forbidden')))
+
+    # parse_retry_after()
+    def test_parse_retry_after(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('12'), 12.0)
+
+        date = formatdate(time.time() + 60, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(date), 60.0, delta=2.0)